@@ -0,0 +1,65 @@
+"""
+Measure the banded compositor's speedup on the menus' full-screen layers.
+
+    python benchmarks/bench_compositor.py --threads 1 2 4 8
+
+Every thread count's output is checked to be byte-identical to the
+single-threaded result.
+"""
+import argparse
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--frames", type=int, default=100)
+    args = parser.parse_args()
+    
+    from config import RENDERER
+    from src.compositor import BandedCompositor
+    from src.ui.effects import get_backdrop, get_panel
+    
+    target = RENDERER.read_pixels().copy()
+    width = RENDERER.size[0]
+    backdrop = get_backdrop(RENDERER.size)
+    overlay = get_panel(target.get_size(), (0, 0, 0, 160))
+    
+    def layers(frame):
+        # Same stack the menus draw, with a moving background offset
+        offset = (frame * 0.1) % width
+        return [(backdrop, (-offset, 0)), (backdrop, (width - offset, 0)), (overlay, (0, 0))]
+    
+    reference = None
+    baseline = None
+    print(f"{'threads':>8}{'ms/frame':>12}{'speedup':>10}{'identical':>11}")
+    # The single-threaded run is the reference for output and speed
+    for threads in [1] + [t for t in args.threads if t != 1]:
+        compositor = BandedCompositor(threads)
+        
+        # Check a few frames against the single-threaded output
+        outputs = []
+        for frame in (0, 7, 13):
+            compositor.compose(target, layers(frame))
+            outputs.append(pygame.image.tobytes(target, "RGB"))
+        if reference is None:
+            reference = outputs
+        
+        start = time.perf_counter()
+        for frame in range(args.frames):
+            compositor.compose(target, layers(frame))
+        ms = (time.perf_counter() - start) * 1000 / args.frames
+        compositor.close()
+        
+        baseline = baseline or ms
+        print(f"{threads:>8}{ms:>12.2f}{baseline / ms:>9.2f}x{str(outputs == reference):>11}")
+
+if __name__ == "__main__":
+    main()
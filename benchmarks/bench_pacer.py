@@ -0,0 +1,70 @@
+"""
+Compare frame pacing precision of pygame's Clock.tick and the FramePacer.
+
+    python benchmarks/bench_pacer.py --rates 60 120 144 --frames 300
+
+Each frame does a little simulated work, then waits for the next frame.
+Jitter is the standard deviation of the frame interval.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+
+from src.game.pacer import FramePacer
+
+class ClockPacer(FramePacer):
+    """Measures Clock.tick the same way the FramePacer measures itself."""
+
+    def __init__(self, rate):
+        super().__init__(rate)
+        self.clock = pygame.time.Clock()
+
+    def reset(self):
+        self.clock.tick()
+        super().reset()
+
+    def wait(self, deadline):
+        self.clock.tick(self.rate)
+
+def run(pacer, frames, work_ms):
+    """Pace frames with simulated work and return the pacer's stats."""
+    rng = random.Random(0)
+    pacer.reset()
+    for _ in range(frames):
+        # Busy work varying from frame to frame, like drawing a menu
+        end = time.perf_counter() + rng.uniform(0.5, 1.5) * work_ms / 1000
+        while time.perf_counter() < end:
+            pass
+        pacer.tick()
+    return pacer.stats()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rates", type=int, nargs="+", default=[60, 120, 144])
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--work-ms", type=float, default=4.0, help="average simulated work per frame")
+    args = parser.parse_args()
+
+    pygame.init()
+    print(f"{'rate':>5} {'pacer':<7}{'target':>8}{'mean':>8}{'jitter':>8}{'p99':>8}{'max':>8}{'missed':>8}")
+    for rate in args.rates:
+        for name, pacer in (("clock", ClockPacer(rate)), ("pacer", FramePacer(rate))):
+            stats = run(pacer, args.frames, args.work_ms)
+            print(f"{rate:>5} {name:<7}{stats['target']:>8.2f}{stats['mean']:>8.2f}{stats['jitter']:>8.3f}"
+                  f"{stats['p99']:>8.2f}{stats['max']:>8.2f}{stats['missed']:>8}")
+
+    # Uncapped, to show the work-only interval
+    stats = run(FramePacer(0), args.frames, args.work_ms)
+    print(f"{'-':>5} {'uncap':<7}{'-':>8}{stats['mean']:>8.2f}{stats['jitter']:>8.3f}"
+          f"{stats['p99']:>8.2f}{stats['max']:>8.2f}{'-':>8}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Compare render backends on the same menu scenes.
+
+Each backend runs in its own process, since the backend owns the window:
+
+    python benchmarks/bench_render.py --frames 300
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCENES = ("main_menu", "main_menu_hover", "settings")
+
+def run_child(backend, frames):
+    """Render every scene with one backend and print ms/frame as JSON."""
+    os.environ["ROF_RENDER_BACKEND"] = backend
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    sys.path.insert(0, ROOT_DIR)
+    
+    from src.game import input as game_input
+    from src.ui.effects import seed_effects
+    from src.ui.menu import MainMenu
+    from src.ui.settings_menu import SettingsMenu
+    
+    class FixedMouse(game_input.LiveInput):
+        """Holds the mouse still so every backend draws the same frames."""
+        pos = (0, 0)
+        
+        def mouse_pos(self):
+            return self.pos
+    
+    mouse = FixedMouse()
+    game_input.set_source(mouse)
+    seed_effects(0)
+    
+    main_menu = MainMenu()
+    settings_menu = SettingsMenu()
+    hover_pos = main_menu.buttons['start'].rect.center
+    scenes = {
+        "main_menu": (main_menu, (0, 0)),
+        "main_menu_hover": (main_menu, hover_pos),
+        "settings": (settings_menu, (0, 0)),
+    }
+    
+    results = {}
+    for name in SCENES:
+        scene, mouse.pos = scenes[name]
+        # Warm caches and textures before timing
+        for _ in range(10):
+            scene.update(1 / 60)
+            scene.draw()
+        start = time.perf_counter()
+        for _ in range(frames):
+            scene.update(1 / 60)
+            scene.draw()
+        results[name] = (time.perf_counter() - start) * 1000 / frames
+    print(json.dumps(results))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--backends", nargs="+", default=["surface", "texture-software"])
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    if args.child:
+        run_child(args.child, args.frames)
+        return
+    
+    results = {}
+    for backend in args.backends:
+        out = subprocess.run([sys.executable, __file__, "--child", backend, "--frames", str(args.frames)],
+                             capture_output=True, text=True, check=True).stdout
+        results[backend] = json.loads(out.strip().splitlines()[-1])
+    
+    print(f"{'scene':<18}" + "".join(f"{b:>20}" for b in args.backends))
+    for scene in SCENES:
+        print(f"{scene:<18}" + "".join(f"{results[b][scene]:>17.2f} ms" for b in args.backends))
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,19 @@ Configuration settings and constants for the game.
 import os
 import pygame
 
+from src.audio import MusicService
+from src.fonts import FontRegistry
+from src.memory import tracker as SURFACE_MEMORY
+from src.render import create_backend
+from src.game.pacer import FramePacer
+
+# Headless mode runs the game logic and scenes with no window or audio
+# device, e.g. for scripted playtests
+HEADLESS = os.environ.get("ROF_HEADLESS") == "1"
+if HEADLESS:
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
 # Initialize pygame
 pygame.init()
 
@@ -13,9 +26,56 @@ ASSETS_DIR = os.path.join(ROOT_DIR, "assets")
 AUDIO_DIR = os.path.join(ROOT_DIR, "audio_files")
 
 # Display settings
-WIDTH, HEIGHT = 1920, 1080
-SCREEN = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("Realms of Fate: Chronicles Unbound")
+WIDTH, HEIGHT = 1920, 1080  # Windowed size; fullscreen uses the desktop resolution
+RENDER_BACKEND = "headless" if HEADLESS else os.environ.get("ROF_RENDER_BACKEND", "surface")  # surface, texture or texture-software
+COMPOSITOR_THREADS = int(os.environ.get("ROF_COMPOSITOR_THREADS", 1))  # Threads for full-screen blends
+VSYNC = os.environ.get("ROF_VSYNC") == "1"  # Present in step with the display (texture backends)
+# pygame can't query the refresh rate, so it's a setting; vsync pacing depends on it
+REFRESH_RATE = int(os.environ.get("ROF_REFRESH_RATE", 60))
+RENDERER = create_backend(RENDER_BACKEND, (WIDTH, HEIGHT), "Realms of Fate: Chronicles Unbound",
+                          COMPOSITOR_THREADS, VSYNC, SURFACE_MEMORY)
+
+# Timing settings
+FPS = int(os.environ.get("ROF_FPS", 60))  # Render frame cap, e.g. 60, 120 or 144; 0 for uncapped
+FRAME_SPIN_MS = 1.0  # Time before each frame deadline spent spinning for precision
+SIMULATION_RATE = 60  # Fixed simulation steps per second
+MAX_CATCHUP_STEPS = 5  # Most simulation steps run for a single rendered frame
+BG_SCROLL_SPEED = 6.0  # Background scroll in pixels per second
+PREWARM_BUDGET_MS = 2.0  # Time per idle frame spent warming other scenes' caches
+PACER = FramePacer(FPS, FRAME_SPIN_MS, vsync=RENDERER.vsync, refresh=REFRESH_RATE)  # Shared by every scene
+LATE_LATCH_CURSOR = os.environ.get("ROF_LATE_LATCH", "1") != "0"  # Sample the cursor just before present
+
+# Graphics quality: auto, low, medium, high or ultra
+# Headless runs pin it, since auto quality depends on machine speed
+QUALITY_MODE = os.environ.get("ROF_QUALITY", "high" if HEADLESS else "auto")
+
+# Music settings
+MUSIC_VOLUME = 0.4  # Default music volume, 0.0 to 1.0
+MUSIC_CROSSFADE = 2.0  # Seconds to fade out the old track, and again to fade in the new one
+MUSIC_PLAYLISTS = {  # Tracks in audio_files/ played for each scene, in order
+    "main_menu": ["background_music.mp3"],
+    "settings": ["background_music.mp3"],
+}
+
+# Memory settings
+# Budget for long-lived surfaces and caches: room for SURFACE_BUDGET_SCREENS
+# full-screen surfaces at the current display size but at least
+# SURFACE_BUDGET_MIN_MB, unless set in MB per instance
+SURFACE_BUDGET_SCREENS = 8
+SURFACE_BUDGET_MIN_MB = 64
+SURFACE_BUDGET_MB = os.environ.get("ROF_SURFACE_BUDGET_MB")
+
+def set_surface_budget(old_size=None, size=None):
+    """Set the surface budget for the display size; called again whenever it changes."""
+    if SURFACE_BUDGET_MB:
+        SURFACE_MEMORY.budget = int(SURFACE_BUDGET_MB) * 1024 * 1024
+    else:
+        width, height = size or RENDERER.size
+        SURFACE_MEMORY.budget = max(SURFACE_BUDGET_MIN_MB * 1024 * 1024,
+                                    SURFACE_BUDGET_SCREENS * width * height * 4)
+
+set_surface_budget()
+RENDERER.add_resize_callback(set_surface_budget)
 
 # Colors
 BLACK = (0, 0, 0)
@@ -28,15 +88,10 @@ LIGHT_RED = (178, 34, 34, 220)  # For hover effect with transparency
 VERY_DARK_PURPLE = (40, 0, 40)  # For title frame
 
 # Fonts
-try:
-    TITLE_FONT = pygame.font.Font(os.path.join(ASSETS_DIR, "medieval.ttf"), 80)
-    SUBTITLE_FONT = pygame.font.Font(os.path.join(ASSETS_DIR, "medieval.ttf"), 40)
-    MENU_FONT = pygame.font.Font(os.path.join(ASSETS_DIR, "medieval.ttf"), 45)
-except:
-    print("Warning: Could not load custom fonts, using system fonts")
-    TITLE_FONT = pygame.font.SysFont("serif", 80)
-    SUBTITLE_FONT = pygame.font.SysFont("serif", 40)
-    MENU_FONT = pygame.font.SysFont("serif", 45)
+FONTS = FontRegistry(os.path.join(ASSETS_DIR, "medieval.ttf"))
+TITLE_FONT = FONTS.custom(80)
+SUBTITLE_FONT = FONTS.custom(40)
+MENU_FONT = FONTS.custom(45)
 
 # Asset loading helper functions
 def load_image(filename, size=None):
@@ -63,12 +118,9 @@ def load_sound(filename):
 # Load common assets
 BACKGROUND_IMG = load_image("fantasy_background.jpg", (WIDTH, HEIGHT))
 CURSOR_IMG = load_image("fantasy_cursor.png", (32, 32))
-BUTTON_SOUND = load_sound("menu_button.mp3")
-
-# Try to load and play background music
-try:
-    pygame.mixer.music.load(os.path.join(AUDIO_DIR, "background_music.mp3"))
-    pygame.mixer.music.set_volume(0.4)
-    pygame.mixer.music.play(-1)
-except:
-    print("Warning: Could not load background music")
\ No newline at end of file
+BUTTON_SOUND = None if HEADLESS else load_sound("menu_button.mp3")
+SURFACE_MEMORY.track("config", "background", BACKGROUND_IMG)
+SURFACE_MEMORY.track("config", "cursor", CURSOR_IMG)
+
+# Background music; tracks load on the music thread, so missing files cost nothing here
+MUSIC = MusicService(AUDIO_DIR, {} if HEADLESS else MUSIC_PLAYLISTS, MUSIC_VOLUME, MUSIC_CROSSFADE)
\ No newline at end of file
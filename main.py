@@ -3,6 +3,7 @@ Realms of Fate: Chronicles Unbound
 
 Main entry point for the game.
 """
+import argparse
 import pygame
 import sys
 import os
@@ -10,6 +11,41 @@ import os
 # Add the project root to the path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+from src.render import BACKENDS
+
+def parse_args():
+    """Parse command line options."""
+    parser = argparse.ArgumentParser(description="Realms of Fate: Chronicles Unbound")
+    parser.add_argument("--record", metavar="PATH", help="record input to a replay file")
+    parser.add_argument("--replay", metavar="PATH", help="replay a recorded input file headlessly")
+    parser.add_argument("--realtime", action="store_true", help="replay at the recorded speed instead of as fast as possible")
+    parser.add_argument("--timings", metavar="PATH", help="write per-frame replay timings to a CSV file")
+    parser.add_argument("--latency", action="store_true", help="report input-to-present latency on exit")
+    parser.add_argument("--fps", type=int, help="frame rate cap, e.g. 120 or 144; 0 for uncapped (default: 60)")
+    parser.add_argument("--vsync", action="store_true", help="present in step with the display (texture backends)")
+    parser.add_argument("--pacing", action="store_true", help="report frame interval jitter and a histogram on exit")
+    parser.add_argument("--backend", choices=BACKENDS, help="render backend (default: surface)")
+    parser.add_argument("--quality", choices=("auto", "low", "medium", "high", "ultra"),
+                        help="graphics quality (default: auto, or the recorded tiers when replaying)")
+    return parser.parse_args()
+
+args = parse_args()
+
+# The backend is chosen when config creates the window
+if args.backend:
+    os.environ["ROF_RENDER_BACKEND"] = args.backend
+if args.fps is not None:
+    os.environ["ROF_FPS"] = str(args.fps)
+if args.vsync:
+    os.environ["ROF_VSYNC"] = "1"
+if args.quality:
+    os.environ["ROF_QUALITY"] = args.quality
+
+# Replays run without a real window or audio device
+if args.replay:
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
 # Initialize pygame
 pygame.init()
 pygame.mixer.init()
@@ -18,9 +54,42 @@ pygame.mixer.init()
 from src.ui.menu import MainMenu
 from src.ui.settings_menu import SettingsMenu
 from src.game.state import GameState
+from src.game import input as game_input
+from src.game.replay import InputRecorder, InputReplay
+from src.game.prewarm import prewarmer
+from src.game.latency import latency
+from src.ui.effects import seed_effects
+from src.ui.quality import quality
+from config import RENDERER, MUSIC, PACER, PREWARM_BUDGET_MS
+
+def setup_input():
+    """Install a recording or replay input source if requested."""
+    if args.replay:
+        source = InputReplay(args.replay, realtime=args.realtime)
+        # Lay out at the recorded display sizes, whatever this machine's desktop is
+        RENDERER.pin_sizes(source.size, source.display_sizes)
+        # Auto quality depends on machine speed, so follow the recorded tiers
+        # unless a quality was asked for
+        if not args.quality:
+            mode, tier = source.quality
+            quality.follow(mode, tier, source.recorded_tiers)
+    elif args.record:
+        source = InputRecorder(args.record, RENDERER.size, (quality.mode, quality.tier))
+        RENDERER.add_mode_callback(source.display_changed)
+        quality.add_tier_callback(source.tier_changed)
+    else:
+        return
+    
+    # Particle layouts must match between recording and replay
+    seed_effects(source.seed)
+    game_input.set_source(source)
 
 def main():
     """Main entry point for the game."""
+    # Set up input before anything consumes random numbers
+    setup_input()
+    latency.enabled = args.latency
+    
     # Set up the game state
     game_state = GameState()
     
@@ -28,10 +97,20 @@ def main():
     main_menu = MainMenu()
     settings_menu = SettingsMenu()
     
+    # Warm scenes in the background while the current one is idle
+    prewarmer.budget_ms = PREWARM_BUDGET_MS
+    prewarmer.prepare = RENDERER.prepare
+    prewarmer.register("main_menu", main_menu, reachable=("settings",))
+    prewarmer.register("settings", settings_menu, reachable=("main_menu",))
+    # A display-mode change drops size-keyed caches, so scenes need warming again
+    RENDERER.add_resize_callback(lambda old_size, new_size: prewarmer.invalidate_all())
+    
     # Main game loop
     while True:
         # Get the current state
         current_state = game_state.current_state
+        prewarmer.set_current(current_state)
+        MUSIC.play_scene(current_state)
         
         # Handle different game states
         if current_state == "main_menu":
@@ -66,4 +145,15 @@ def main():
                 sys.exit()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    try:
+        main()
+    finally:
+        MUSIC.close()
+        source = game_input.get_source()
+        source.close()
+        if args.timings and isinstance(source, InputReplay):
+            source.write_timings(args.timings)
+        if args.latency:
+            latency.report()
+        if args.pacing:
+            PACER.report()
\ No newline at end of file
@@ -0,0 +1,267 @@
+"""
+Run scripted playtest sessions headlessly across a process pool.
+
+Each session drives the real menus with scripted mouse input (menu
+navigation, settings changes, new game, save and load) without a window,
+audio device or frame cap, and reports its timing and a checksum of the
+final game state and settings. Sessions of the same script should always
+produce the same checksum.
+
+    python playtest.py --sessions 1000 --workers 8
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+# Workers inherit this, so config sets itself up without a window or audio
+os.environ["ROF_HEADLESS"] = "1"
+
+# Scripted sessions. Each step is (action, *args):
+#   ("click", button)         click a button on the current menu
+#   ("drag", slider, value)   drag a settings slider to a value from 0.0 to 1.0
+#   ("pick", toggle[, index]) click a settings toggle or one of its options
+#   ("act", changes)          apply changes to the player data (gameplay stand-in)
+#   ("save", slot) / ("load", slot)
+SCRIPTS = {
+    "new_game": [
+        ("click", "start"),
+        ("act", {"gold": 25, "location": "Ashford"}),
+        ("save", "slot_1"),
+        ("act", {"gold": 0, "location": "Crypt"}),
+        ("load", "slot_1"),
+    ],
+    "settings": [
+        ("click", "settings"),
+        ("drag", "music", 0.25),
+        ("drag", "sfx", 0.8),
+        ("pick", "difficulty", 2),
+        ("pick", "quality", 1),
+        ("pick", "fullscreen"),
+        ("click", "back"),
+        ("click", "settings"),
+        ("pick", "difficulty", 0),
+        ("click", "back"),
+    ],
+    "full": [
+        ("click", "settings"),
+        ("drag", "music", 0.6),
+        ("pick", "difficulty", 1),
+        ("click", "back"),
+        ("click", "start"),
+        ("act", {"gold": 10, "quest": "The Sunken Keep"}),
+        ("save", "save_001"),
+        ("act", {"gold": 99}),
+        ("click", "load"),
+    ],
+}
+
+class PlaytestError(Exception):
+    """A scripted session didn't go the way its script expected."""
+
+def scripted_input(fps):
+    """Create the scripted input source; pygame is only imported in workers."""
+    import pygame
+    from src.game.input import LiveInput
+
+    class ScriptedInput(LiveInput):
+        """Feeds queued frames of mouse input to the scenes without waiting."""
+
+        def __init__(self):
+            self.frames = deque()  # (mouse position, events)
+            self.pos = (0, 0)
+            self.dt = 1.0 / (fps or 60)
+            self.frame_count = 0
+
+        def queue(self, pos, *events, idle=1):
+            """Queue a frame with the mouse at pos, then idle frames to let hover settle."""
+            self.frames.append((pos, list(events)))
+            for _ in range(idle):
+                self.frames.append((pos, []))
+
+        def move(self, pos):
+            rel = (pos[0] - self.pos[0], pos[1] - self.pos[1])
+            self.queue(pos, pygame.event.Event(pygame.MOUSEMOTION, pos=pos, rel=rel, buttons=(0, 0, 0)))
+
+        def click(self, pos):
+            self.move(pos)
+            self.queue(pos, pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=pos, button=1))
+            self.queue(pos, pygame.event.Event(pygame.MOUSEBUTTONUP, pos=pos, button=1))
+
+        def drag(self, start, end):
+            self.move(start)
+            self.queue(start, pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=start, button=1))
+            self.queue(end, pygame.event.Event(pygame.MOUSEMOTION, pos=end, rel=(end[0] - start[0], 0), buttons=(1, 0, 0)))
+            self.queue(end, pygame.event.Event(pygame.MOUSEBUTTONUP, pos=end, button=1))
+
+        def poll(self):
+            if not self.frames:
+                raise PlaytestError("Script ran out of input before the scene changed")
+            self.pos, events = self.frames.popleft()
+            self.frame_count += 1
+            return events
+
+        def mouse_pos(self):
+            return self.pos
+
+        def latched_mouse_pos(self):
+            return self.pos
+
+        def frame_time(self, pacer):
+            return self.dt
+
+    return ScriptedInput()
+
+class Session:
+    """One scripted playthrough with fresh game state and menus."""
+
+    def __init__(self, seed):
+        from config import FPS, QUALITY_MODE
+        from src.game import input as game_input
+        from src.game.state import GameState
+        from src.ui.effects import seed_effects
+        from src.ui.menu import MainMenu
+        from src.ui.quality import quality
+        from src.ui.settings_menu import SettingsMenu
+
+        # Undo anything an earlier session in this worker changed
+        quality.set_mode(QUALITY_MODE)
+        seed_effects(seed)
+        self.input = scripted_input(FPS)
+        game_input.set_source(self.input)
+
+        self.game_state = GameState()
+        self.scenes = {"main_menu": MainMenu(), "settings": SettingsMenu()}
+
+    @property
+    def scene(self):
+        """The menu for the current state."""
+        name = self.game_state.current_state
+        if name not in self.scenes:
+            raise PlaytestError(f"No menu to interact with in state {name!r}")
+        return self.scenes[name]
+
+    def run(self, steps):
+        """Play through steps in order."""
+        for action, *args in steps:
+            getattr(self, f"do_{action}")(*args)
+
+    def run_scene(self):
+        """Run the current menu until it asks for another state, as main() does."""
+        next_state = self.scene.run()
+        if self.game_state.current_state == "main_menu":
+            if next_state == "new_game":
+                self.game_state.new_game()
+            elif next_state == "load_game":
+                self.game_state.load_game("save_001")
+            elif next_state == "settings":
+                self.game_state.change_state("settings")
+        elif self.game_state.current_state == "settings":
+            if next_state == "main_menu":
+                self.game_state.change_state("main_menu")
+
+    def do_click(self, button):
+        # Gameplay is still a placeholder that drops straight back to the menu
+        if self.game_state.current_state == "gameplay":
+            self.game_state.change_state("main_menu")
+        self.input.click(self.scene.buttons[button].rect.center)
+        self.run_scene()
+
+    def do_drag(self, slider, value):
+        rect = self.scene.slider_regions[slider]
+        self.input.drag(rect.center, (int(rect.left + rect.width * value), rect.centery))
+
+    def do_pick(self, toggle, index=None):
+        region = self.scene.toggle_regions[toggle]
+        rect = region if index is None else region[index]
+        self.input.click(rect.center)
+
+    def do_act(self, changes):
+        if self.game_state.player is None:
+            raise PlaytestError("No game in progress to act in")
+        self.game_state.player.update(changes)
+
+    def do_save(self, slot):
+        self.game_state.save_game(slot)
+
+    def do_load(self, slot):
+        self.game_state.load_game(slot)
+
+    def checksum(self):
+        """Digest of the final game state and settings."""
+        data = json.dumps({
+            "state": self.game_state.checksum(),
+            "settings": self.scenes["settings"].settings,
+        }, sort_keys=True)
+        return hashlib.sha256(data.encode("utf-8")).hexdigest()[:16]
+
+def init_worker(verbose):
+    """Set up a worker process: silence game output and load config once."""
+    if not verbose:
+        sys.stdout = open(os.devnull, "w")
+    import config  # noqa: F401
+
+def run_session(job):
+    """Play one scripted session and return its result."""
+    script, seed = job
+    start = time.perf_counter()
+    result = {"script": script, "seed": seed, "ok": True, "error": None, "frames": 0, "checksum": None}
+    try:
+        session = Session(seed)
+        session.run(SCRIPTS[script])
+        result["frames"] = session.input.frame_count
+        result["checksum"] = session.checksum()
+    except (Exception, SystemExit) as e:
+        result["ok"] = False
+        result["error"] = f"{type(e).__name__}: {e}"
+    result["ms"] = (time.perf_counter() - start) * 1000
+    return result
+
+def summarize(results, elapsed, workers):
+    """Print per-script timings, failures and checksum agreement."""
+    print(f"{'script':<12} {'sessions':>8} {'failed':>7} {'mean ms':>9} {'p95 ms':>9} {'ms/frame':>9}  checksums")
+    for script in sorted({r["script"] for r in results}):
+        runs = [r for r in results if r["script"] == script]
+        passed = [r for r in runs if r["ok"]]
+        times = sorted(r["ms"] for r in passed) or [0.0]
+        frames = sum(r["frames"] for r in passed)
+        checksums = sorted({r["checksum"] for r in passed})
+        print(f"{script:<12} {len(runs):>8} {len(runs) - len(passed):>7} "
+              f"{sum(times) / len(times):>9.1f} {times[min(len(times) - 1, int(0.95 * len(times)))]:>9.1f} "
+              f"{sum(times) / max(frames, 1):>9.2f}  {', '.join(checksums) or '-'}")
+        if len(checksums) > 1:
+            print(f"Warning: {script} sessions disagree on the final state")
+        for error in sorted({r["error"] for r in runs if not r["ok"]}):
+            print(f"  {error}")
+
+    rate = len(results) / elapsed * 3600 if elapsed else 0
+    print(f"Ran {len(results)} sessions in {elapsed:.1f} s on {workers} workers ({rate:.0f} sessions/hour)")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=len(SCRIPTS), help="total sessions, spread across the scripts")
+    parser.add_argument("--scripts", nargs="+", choices=sorted(SCRIPTS), default=sorted(SCRIPTS))
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--results", metavar="PATH", help="write every session's result as JSON lines")
+    parser.add_argument("--verbose", action="store_true", help="show the game's own output")
+    args = parser.parse_args()
+
+    jobs = [(args.scripts[i % len(args.scripts)], i) for i in range(args.sessions)]
+    start = time.perf_counter()
+    with ProcessPoolExecutor(args.workers, initializer=init_worker, initargs=(args.verbose,)) as pool:
+        results = list(pool.map(run_session, jobs, chunksize=max(1, len(jobs) // (args.workers * 4))))
+    elapsed = time.perf_counter() - start
+
+    if args.results:
+        with open(args.results, "w") as f:
+            for result in results:
+                f.write(json.dumps(result) + "\n")
+    summarize(results, elapsed, args.workers)
+    return 0 if all(r["ok"] for r in results) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
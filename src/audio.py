@@ -0,0 +1,150 @@
+"""
+Background music service.
+
+All file access, decoding and mixer calls for music happen on a worker
+thread; the game only queues commands, so a track change or a missing file
+never stalls a frame. Tracks are streamed through pygame's music channel,
+so only SDL_mixer's small decode buffer is resident rather than a whole
+decoded track. That channel plays one track at a time, so switching tracks
+fades the current one out and then fades the next one in.
+"""
+import os
+import queue
+import threading
+import time
+import pygame
+
+class MusicService:
+    """Streams per-scene playlists with fades from a worker thread."""
+
+    def __init__(self, audio_dir, playlists=None, volume=0.4, crossfade=2.0,
+                 mixer=pygame.mixer, poll_interval=0.25):
+        self.audio_dir = audio_dir
+        self.mixer = mixer
+        self.crossfade = crossfade  # Seconds for each of the fade out and fade in
+        self.poll_interval = poll_interval  # How often the worker checks for a track ending
+        self.commands = queue.Queue()
+
+        # Worker-side state; only touched from the worker thread
+        self.playlists = dict(playlists or {})
+        self.volume = volume
+        self.tracks = []
+        self.index = -1
+        self.current = None  # Track being streamed
+        self.start_at = None  # When to start the next track, once the last has faded out
+        self.missing = set()
+
+        self.worker = threading.Thread(target=self.run, name="music", daemon=True)
+        self.worker.start()
+
+    # Game-side API: each call just queues a command for the worker
+
+    def set_playlist(self, scene, tracks):
+        """Set the tracks played, in order and looping, while scene is active."""
+        self.commands.put(("playlist", (scene, list(tracks))))
+
+    def play_scene(self, scene):
+        """Switch to scene's playlist, fading between tracks unless it's already playing."""
+        self.commands.put(("scene", scene))
+
+    def set_volume(self, volume):
+        """Set the music volume, 0.0 to 1.0."""
+        self.commands.put(("volume", volume))
+
+    def stop(self):
+        """Fade out and stop the music."""
+        self.commands.put(("scene", None))
+
+    def close(self, timeout=1.0):
+        """Stop the worker thread."""
+        self.commands.put(("close", None))
+        self.worker.join(timeout)
+
+    # Worker thread
+
+    def run(self):
+        """Process commands and move through the playlist until closed."""
+        while True:
+            try:
+                command, arg = self.commands.get(timeout=self.poll_interval)
+            except queue.Empty:
+                command, arg = None, None
+            if command == "close":
+                return
+            try:
+                if command == "playlist":
+                    scene, tracks = arg
+                    self.playlists[scene] = tracks
+                elif command == "scene":
+                    self.switch_playlist(self.playlists.get(arg, []))
+                elif command == "volume":
+                    self.apply_volume(arg)
+                self.advance()
+            except pygame.error as e:
+                print(f"Warning: Music playback failed: {e}")
+
+    def ready(self):
+        """Whether the mixer is up to play music."""
+        return bool(self.mixer.get_init())
+
+    def open(self, track):
+        """Load track for streaming; False if it's unavailable."""
+        if track in self.missing:
+            return False
+
+        path = os.path.join(self.audio_dir, track)
+        try:
+            self.mixer.music.load(path)
+        except (pygame.error, OSError):
+            # Only warn once per track
+            print(f"Warning: Could not load music {track}")
+            self.missing.add(track)
+            return False
+        self.mixer.music.set_volume(self.volume)
+        return True
+
+    def switch_playlist(self, tracks):
+        """Start tracks from the beginning unless they're already playing."""
+        if tracks == self.tracks:
+            return
+        self.tracks = tracks
+        self.index = -1
+        self.fade_to_next()
+
+    def fade_to_next(self):
+        """Fade the current track out; the next one starts once it's silent."""
+        if not self.ready():
+            return
+        if self.current:
+            self.mixer.music.fadeout(int(self.crossfade * 1000))
+            self.current = None
+            self.start_at = time.perf_counter() + self.crossfade
+        else:
+            self.start_at = time.perf_counter()
+
+    def play_next(self):
+        """Stream the next playable track, fading it in; stay silent if there is none."""
+        self.start_at = None
+        for _ in range(len(self.tracks)):
+            self.index = (self.index + 1) % len(self.tracks)
+            track = self.tracks[self.index]
+            if self.open(track):
+                # A single-track playlist loops without a gap
+                loops = -1 if len(self.tracks) == 1 else 0
+                self.mixer.music.play(loops, fade_ms=int(self.crossfade * 1000))
+                self.current = track
+                return
+
+    def advance(self):
+        """Start the next track once the last one has faded out or finished."""
+        if self.start_at is not None:
+            if time.perf_counter() >= self.start_at:
+                self.play_next()
+        elif self.current and not self.mixer.music.get_busy():
+            self.play_next()
+
+    def apply_volume(self, volume):
+        """Set the music volume."""
+        self.volume = volume
+        if self.ready():
+            self.mixer.music.set_volume(volume)
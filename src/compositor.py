@@ -0,0 +1,54 @@
+"""
+Banded multi-threaded compositing of full-screen layers.
+
+pygame releases the GIL while blitting, so large blits can be split into
+horizontal bands and run on a thread pool. Each band only touches its own
+rows of the target, so the result is identical to blitting in one go.
+"""
+from concurrent.futures import ThreadPoolExecutor
+import pygame
+
+class BandedCompositor:
+    """Blits a stack of layers onto a target, one horizontal band per thread."""
+    
+    def __init__(self, threads=1):
+        self.threads = max(1, threads)
+        self.pool = ThreadPoolExecutor(self.threads, thread_name_prefix="compositor") if self.threads > 1 else None
+        self.bands = {}  # target size -> band rects
+    
+    def get_bands(self, size):
+        """Split a target of the given size into one band per thread."""
+        bands = self.bands.get(size)
+        if bands is None:
+            width, height = size
+            step = -(-height // self.threads)  # Ceiling division
+            bands = [pygame.Rect(0, top, width, min(step, height - top))
+                     for top in range(0, height, step)]
+            self.bands[size] = bands
+        return bands
+    
+    def compose(self, target, layers):
+        """Blit each (surface, dest) layer onto target in order."""
+        # Blits truncate positions; do it up front so every band agrees
+        layers = [(surface, (int(dest[0]), int(dest[1]))) for surface, dest in layers]
+        
+        if self.pool is None:
+            for surface, dest in layers:
+                target.blit(surface, dest)
+            return
+        
+        bands = self.get_bands(target.get_size())
+        # Wait for every band before returning, so the frame is complete before flip
+        list(self.pool.map(lambda band: self.compose_band(target, band, layers), bands))
+    
+    def compose_band(self, target, band, layers):
+        """Blit every layer into one band of target."""
+        area = target.subsurface(band)
+        for surface, (x, y) in layers:
+            area.blit(surface, (x - band.x, y - band.y))
+    
+    def close(self):
+        """Shut down the worker threads."""
+        if self.pool is not None:
+            self.pool.shutdown()
+            self.pool = None
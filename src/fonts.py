@@ -0,0 +1,83 @@
+"""
+Font registry.
+
+Each (family, size) pair is loaded once and reused. Resolving a system font
+family to a file goes through fontconfig, which is slow, so resolved paths
+are also persisted to disk for later launches.
+"""
+import json
+import os
+import pygame
+
+def default_cache_path():
+    """Return the per-user location of the font path cache."""
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(cache_home, "realms_of_fate", "font_paths.json")
+
+class FontRegistry:
+    """Loads fonts once per (family, size) and remembers resolved font paths."""
+    
+    def __init__(self, custom_path=None, cache_path=None):
+        self.custom_path = custom_path
+        self.cache_path = cache_path or default_cache_path()
+        self.fonts = {}
+        self.paths = self.load_cache()
+        self.custom_failed = False
+    
+    def load_cache(self):
+        """Read previously resolved font paths, dropping any that have vanished."""
+        try:
+            with open(self.cache_path) as f:
+                paths = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return {family: path for family, path in paths.items()
+                if path is None or os.path.exists(path)}
+    
+    def save_cache(self):
+        """Persist resolved font paths; failing to write is not fatal."""
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            tmp_path = self.cache_path + ".tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(self.paths, f, indent=2)
+            os.replace(tmp_path, self.cache_path)
+        except OSError:
+            print(f"Warning: Could not write font cache {self.cache_path}")
+    
+    def resolve(self, family):
+        """Return the file for a system font family, or None for pygame's default."""
+        family = family.lower()
+        if family not in self.paths:
+            # Only ask fontconfig for families we haven't seen before
+            self.paths[family] = pygame.font.match_font(family)
+            self.save_cache()
+        return self.paths[family]
+    
+    def get(self, family, size):
+        """Return the system font for family at the given size."""
+        key = (family.lower(), size)
+        font = self.fonts.get(key)
+        if font is None:
+            font = pygame.font.Font(self.resolve(family), size)
+            self.fonts[key] = font
+        return font
+    
+    def custom(self, size, fallback="serif"):
+        """Return the game's custom font, falling back to a system family."""
+        key = ("<custom>", size)
+        font = self.fonts.get(key)
+        if font is not None:
+            return font
+        
+        if self.custom_path and not self.custom_failed:
+            try:
+                font = pygame.font.Font(self.custom_path, size)
+            except (OSError, pygame.error):
+                print("Warning: Could not load custom fonts, using system fonts")
+                self.custom_failed = True
+        
+        if font is None:
+            font = self.get(fallback, size)
+        self.fonts[key] = font
+        return font
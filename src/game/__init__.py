@@ -1,4 +1,8 @@
 """
 Game logic components.
 """
-from src.game.state import GameState
\ No newline at end of file
+from src.game.state import GameState
+from src.game.timestep import FixedTimestep
+from src.game.replay import InputRecorder, InputReplay
+from src.game.prewarm import Prewarmer, prewarmer
+from src.game.latency import LatencyTracker, latency
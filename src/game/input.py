@@ -0,0 +1,71 @@
+"""
+Input sources for the game loop.
+
+Scenes read events, the mouse position and frame times through this module
+instead of calling pygame directly, so a session can be recorded or replayed.
+"""
+import pygame
+
+from src.game.latency import latency
+
+class LiveInput:
+    """Reads input straight from pygame."""
+    
+    def poll(self):
+        """Return the events queued for this frame."""
+        return pygame.event.get()
+    
+    def mouse_pos(self):
+        """Return the current mouse position."""
+        return pygame.mouse.get_pos()
+    
+    def latched_mouse_pos(self):
+        """Pump pending input and return the freshest mouse position."""
+        pygame.event.pump()
+        return pygame.mouse.get_pos()
+    
+    def frame_time(self, pacer):
+        """Wait for the next frame and return the elapsed time in seconds."""
+        return pacer.tick()
+    
+    def close(self):
+        """Release any resources held by the source."""
+        pass
+
+# The source currently feeding the game loop
+_source = LiveInput()
+
+def set_source(source):
+    """Replace the active input source."""
+    global _source
+    _source = source
+
+def get_source():
+    """Return the active input source."""
+    return _source
+
+def poll_events():
+    """Return the events for this frame from the active source."""
+    events = _source.poll()
+    latency.events_polled(events)
+    return events
+
+def get_mouse_pos():
+    """Return the mouse position from the active source."""
+    pos = _source.mouse_pos()
+    latency.mouse_sampled(pos)
+    return pos
+
+def latch_mouse_pos():
+    """Sample the mouse as late as possible, just before presenting a frame."""
+    pos = _source.latched_mouse_pos()
+    latency.cursor_latched(pos)
+    return pos
+
+def next_frame_time(pacer):
+    """Wait for the next frame and return the time in seconds since the previous one.
+    
+    Call this before polling events, so input isn't left waiting while the
+    loop sleeps.
+    """
+    return _source.frame_time(pacer)
@@ -0,0 +1,98 @@
+"""
+Input-to-present latency measurement.
+
+Events are stamped when the game polls them and resolved at the next
+present, which is when their effect reaches the screen. pygame doesn't
+expose SDL's event timestamps, so time an event spent queued before the
+poll isn't counted.
+
+Hover doesn't depend on motion events, which some scenes block at the
+queue, so mouse movement is measured from the positions scenes read
+instead: a frame whose mouse position differs from the last frame's is a
+"mouse move" sample, and a moved late-latched cursor is a "cursor" sample.
+"""
+import time
+import pygame
+
+# Event types whose latency is worth measuring
+TRACKED_EVENTS = (pygame.MOUSEMOTION, pygame.MOUSEBUTTONDOWN, pygame.KEYDOWN)
+
+class LatencyTracker:
+    """Records how long polled input takes to be presented."""
+
+    def __init__(self, tracked=TRACKED_EVENTS):
+        self.tracked = tracked
+        self.enabled = False
+        self.pending = []  # (event name, poll time) waiting for the next present
+        self.polled_at = None  # When this frame's input was polled
+        self.mouse_pos = None  # Mouse position scenes last read
+        self.latched_pos = None  # Cursor position last drawn
+        self.latched_at = None  # When a moved cursor was sampled for drawing
+        self.samples = {}  # Event name, "mouse move" or "cursor" -> latencies in milliseconds
+
+    def events_polled(self, events):
+        """Stamp the tracked events in a freshly polled batch."""
+        if not self.enabled:
+            return
+        now = self.polled_at = time.perf_counter()
+        for event in events:
+            if event.type in self.tracked:
+                self.pending.append((pygame.event.event_name(event.type), now))
+
+    def mouse_sampled(self, pos):
+        """Note a mouse position a scene read; a change since the last one is a move to measure."""
+        if not self.enabled or pos == self.mouse_pos:
+            return
+        moved = self.mouse_pos is not None
+        self.mouse_pos = pos
+        if moved:
+            # The new position arrived with this frame's poll
+            self.pending.append(("mouse move", self.polled_at or time.perf_counter()))
+
+    def cursor_latched(self, pos):
+        """Note the cursor position just sampled for this frame; time it if it moved."""
+        if not self.enabled or pos == self.latched_pos:
+            return
+        if self.latched_pos is not None:
+            self.latched_at = time.perf_counter()
+        self.latched_pos = pos
+
+    def frame_presented(self):
+        """Resolve everything stamped since the last present."""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        for name, polled_at in self.pending:
+            self.samples.setdefault(name, []).append((now - polled_at) * 1000)
+        self.pending.clear()
+        if self.latched_at is not None:
+            self.samples.setdefault("cursor", []).append((now - self.latched_at) * 1000)
+            self.latched_at = None
+
+    def stats(self):
+        """Summarize latencies in milliseconds for each event name."""
+        summary = {}
+        for name, samples in self.samples.items():
+            times = sorted(samples)
+
+            def percentile(p):
+                return times[min(len(times) - 1, int(p / 100 * len(times)))]
+
+            summary[name] = {
+                "count": len(times),
+                "p50": percentile(50),
+                "p95": percentile(95),
+                "p99": percentile(99),
+                "max": times[-1],
+            }
+        return summary
+
+    def report(self):
+        """Print the latency summary."""
+        for name, stats in sorted(self.stats().items()):
+            print(f"Input latency {name} (ms): " + ", ".join(
+                f"{k}={v:.2f}" if isinstance(v, float) else f"{k}={v}"
+                for k, v in stats.items()))
+
+# Shared tracker fed by the input layer and the scenes' present calls
+latency = LatencyTracker()
@@ -0,0 +1,127 @@
+"""
+High-precision frame pacing.
+
+pygame's Clock.tick sleeps in whole milliseconds, so frames at 60 Hz land
+anywhere from 15 to 18 ms apart. The pacer sleeps until shortly before each
+deadline and spins on perf_counter for the rest, and schedules deadlines
+from the ideal timeline so small overshoots don't add up. Every interval is
+recorded for jitter statistics and a histogram.
+
+With vsync, presenting blocks until the display's vblank, so a second
+schedule of our own would only drift against it and periodically push a
+frame past a vblank. When the target rate is at or above the refresh rate
+the pacer doesn't wait at all and lets present pace the frames; below it,
+each wait is measured from the last present, so it stays phase-locked to
+the display.
+"""
+import math
+import time
+from collections import Counter, deque
+
+class FramePacer:
+    """Paces frames to a target rate and records the intervals between them."""
+
+    def __init__(self, rate=60, spin_ms=1.0, vsync=False, refresh=60, history=3600):
+        self.spin = spin_ms / 1000  # Time before a deadline spent spinning instead of sleeping
+        self.vsync = vsync  # Present waits for vblank, so don't spin as well
+        self.refresh = refresh  # Display refresh rate, used with vsync
+        self.intervals = deque(maxlen=history)  # Recent frame intervals in milliseconds
+        self.last = None
+        self.deadline = None
+        self.set_rate(rate)
+
+    def set_rate(self, rate):
+        """Target rate in frames per second; 0 or None runs uncapped."""
+        self.rate = rate or 0
+        self.interval = 1.0 / rate if rate else 0.0
+
+    @property
+    def present_paced(self):
+        """Whether vsync'd presents alone set the frame rate."""
+        return self.vsync and (not self.rate or self.rate >= self.refresh)
+    
+    def presented(self):
+        """Call right after presenting; with vsync, re-base the next deadline on it."""
+        if not self.vsync or not self.interval:
+            return
+        # Present returned at a vblank; wake up one refresh before the vblank
+        # we're aiming for, leaving that long for the frame's work
+        self.deadline = time.perf_counter() + self.interval - 1.0 / self.refresh
+    
+    def reset(self):
+        """Start timing afresh, e.g. after time spent outside the game loop."""
+        self.last = time.perf_counter()
+        self.deadline = self.last + self.interval
+
+    def wait(self, deadline):
+        """Sleep until just before deadline, then spin until it passes."""
+        remaining = deadline - time.perf_counter()
+        if remaining > self.spin:
+            time.sleep(remaining - self.spin)
+        if self.vsync:
+            return  # The flip will line the frame up with the display
+        while time.perf_counter() < deadline:
+            pass
+
+    def tick(self):
+        """Wait for the next frame and return the seconds since the previous one."""
+        if self.last is None:
+            self.reset()
+            return 0.0
+
+        if self.interval and not self.present_paced:
+            self.wait(self.deadline)
+        now = time.perf_counter()
+        elapsed = now - self.last
+        self.last = now
+        self.intervals.append(elapsed * 1000)
+
+        if self.interval:
+            # Keep to the ideal timeline, unless we've fallen a whole frame behind it
+            self.deadline += self.interval
+            if self.deadline < now:
+                self.deadline = now + self.interval
+        return elapsed
+
+    def stats(self):
+        """Summarize recent frame intervals in milliseconds."""
+        times = sorted(self.intervals)
+        if not times:
+            return {}
+
+        def percentile(p):
+            return times[min(len(times) - 1, int(p / 100 * len(times)))]
+
+        mean = sum(times) / len(times)
+        target = self.interval * 1000
+        return {
+            "frames": len(times),
+            "target": target,
+            "mean": mean,
+            "jitter": math.sqrt(sum((t - mean) ** 2 for t in times) / len(times)),  # Standard deviation
+            "p50": percentile(50),
+            "p95": percentile(95),
+            "p99": percentile(99),
+            "max": times[-1],
+            # Frames that took half as long again as they should have
+            "missed": sum(1 for t in times if target and t > target * 1.5),
+        }
+
+    def histogram(self, bucket_ms=0.5):
+        """Return (bucket start in ms, count) pairs for recent frame intervals."""
+        counts = Counter(math.floor(t / bucket_ms) * bucket_ms for t in self.intervals)
+        return sorted(counts.items())
+
+    def report(self, bucket_ms=0.5):
+        """Print the interval statistics and histogram."""
+        stats = self.stats()
+        if not stats:
+            return
+        print("Frame intervals (ms): " + ", ".join(
+            f"{k}={v:.2f}" if isinstance(v, float) else f"{k}={v}"
+            for k, v in stats.items()))
+        histogram = self.histogram(bucket_ms)
+        peak = max(count for _, count in histogram)
+        for start, count in histogram:
+            bar = "#" * max(1, round(40 * count / peak))
+            print(f"  {start:6.1f}-{start + bucket_ms:<6.1f} {count:6d} {bar}")
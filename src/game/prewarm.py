@@ -0,0 +1,90 @@
+"""
+Background pre-warming of scenes.
+
+Scenes expose a prewarm() generator that builds their caches one small step
+at a time, yielding each surface it builds (or None). While the current
+scene is idle, the prewarmer spends a small per-frame budget stepping the
+generators of the scenes reachable from it, so switching lands on a warm
+first frame.
+"""
+import time
+
+class Prewarmer:
+    """Runs scene prewarm steps within a per-frame time budget."""
+    
+    def __init__(self, budget_ms=2.0, prepare=None):
+        self.budget_ms = budget_ms
+        self.prepare = prepare  # Called with each surface a scene builds, e.g. to upload it
+        self.scenes = {}  # name -> (scene, reachable scene names)
+        self.pending = {}  # name -> running prewarm generator
+        self.warm = set()
+        self.current = None
+        self.first_frame_due = False  # Set on a scene switch until its first frame is timed
+        self.switch_time = None
+        self.first_frame_times = {}  # name -> list of first-frame times in ms
+    
+    def register(self, name, scene, reachable=()):
+        """Add a scene and the names of the scenes it can switch to."""
+        self.scenes[name] = (scene, tuple(reachable))
+    
+    def invalidate(self, name):
+        """Mark a scene's caches as cold so it is warmed again."""
+        self.warm.discard(name)
+        self.pending.pop(name, None)
+    
+    def invalidate_all(self):
+        """Mark every scene cold, e.g. after a display-mode change drops their caches."""
+        for name in self.scenes:
+            self.invalidate(name)
+    
+    def set_current(self, name):
+        """Note a scene switch; its first frame will be timed."""
+        self.current = name
+        self.first_frame_due = True
+        self.switch_time = None
+    
+    def frame_started(self):
+        """Call once the frame wait is over; starts timing the first frame after a switch."""
+        if self.first_frame_due and self.switch_time is None:
+            self.switch_time = time.perf_counter()
+    
+    def queue(self):
+        """Scenes still to warm, those reachable from the current one first."""
+        reachable = self.scenes.get(self.current, (None, ()))[1]
+        others = [name for name in self.scenes if name not in reachable]
+        return [name for name in list(reachable) + others
+                if name in self.scenes and name not in self.warm and name != self.current]
+    
+    def frame_done(self, idle=True):
+        """Call after presenting a frame; records first-frame time and prewarms."""
+        now = time.perf_counter()
+        if self.switch_time is not None:
+            ms = (now - self.switch_time) * 1000
+            self.first_frame_times.setdefault(self.current, []).append(ms)
+            print(f"First frame of {self.current}: {ms:.1f} ms")
+            self.first_frame_due = False
+            self.switch_time = None
+        
+        if idle:
+            self.step(now + self.budget_ms / 1000)
+    
+    def step(self, deadline):
+        """Run prewarm steps until deadline (a perf_counter time) passes."""
+        for name in self.queue():
+            steps = self.pending.get(name)
+            if steps is None:
+                steps = self.pending[name] = self.scenes[name][0].prewarm()
+            for surface in steps:
+                if surface is not None and self.prepare:
+                    self.prepare(surface)
+                if time.perf_counter() >= deadline:
+                    return
+            del self.pending[name]
+            self.warm.add(name)
+    
+    def warm_all(self):
+        """Finish warming every scene now, ignoring the budget."""
+        self.step(float("inf"))
+
+# Shared prewarmer for the game loop
+prewarmer = Prewarmer()
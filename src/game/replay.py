@@ -0,0 +1,217 @@
+"""
+Input recording and deterministic replay.
+
+A recording is a gzipped JSON-lines file: a header with the RNG seed,
+display size and starting quality mode and tier, followed by one line per
+frame holding the frame time waited before the frame, the mouse position,
+the events pumped that frame, when the cursor was late-latched, where it was
+drawn, when the display mode changed, the display size after each change
+and, when the quality tier changed, the tiers it changed to.
+"""
+import gzip
+import json
+import random
+import time
+import pygame
+
+from src.game.input import LiveInput
+
+RECORDING_VERSION = 1
+
+# Event types worth recording; everything else is window-system noise
+RECORDED_EVENTS = (
+    pygame.QUIT, pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP,
+    pygame.MOUSEMOTION, pygame.MOUSEWHEEL, pygame.KEYDOWN, pygame.KEYUP,
+)
+
+def encode_event(event):
+    """Turn a pygame event into a JSON-friendly list."""
+    attrs = {}
+    for key, value in event.dict.items():
+        if isinstance(value, (int, float, str, bool)):
+            attrs[key] = value
+        elif isinstance(value, tuple):
+            attrs[key] = list(value)
+    return [event.type, attrs]
+
+def decode_event(data):
+    """Rebuild a pygame event from encode_event output."""
+    event_type, attrs = data
+    attrs = {k: tuple(v) if isinstance(v, list) else v for k, v in attrs.items()}
+    return pygame.event.Event(event_type, attrs)
+
+class InputRecorder(LiveInput):
+    """Reads live input and writes every frame of it to a recording."""
+    
+    def __init__(self, path, size, quality=("high", "high"), seed=None):
+        self.seed = seed if seed is not None else random.randrange(2 ** 32)
+        self.file = gzip.open(path, "wt", encoding="utf-8")
+        self.start = time.perf_counter()
+        self.frame = None
+        self.last_dt = 0.0  # Frame time waited before the next poll
+        mode, tier = quality
+        self.write({"version": RECORDING_VERSION, "seed": self.seed, "size": list(size),
+                    "quality": {"mode": mode, "tier": tier}})
+    
+    def write(self, record):
+        self.file.write(json.dumps(record, separators=(",", ":")) + "\n")
+    
+    def flush_frame(self):
+        """Write out the frame in progress, if any."""
+        if self.frame is not None:
+            self.write(self.frame)
+            self.frame = None
+    
+    def poll(self):
+        """Pump live events and start a new recorded frame."""
+        self.flush_frame()
+        events = pygame.event.get()
+        self.frame = {
+            "t": round(time.perf_counter() - self.start, 6),
+            "dt": self.last_dt,
+            "mouse": list(pygame.mouse.get_pos()),
+            "events": [encode_event(e) for e in events if e.type in RECORDED_EVENTS],
+        }
+        return events
+    
+    def mouse_pos(self):
+        """Return the mouse position sampled at the start of the frame."""
+        if self.frame is None:
+            return pygame.mouse.get_pos()
+        return tuple(self.frame["mouse"])
+    
+    def latched_mouse_pos(self):
+        """Return the late-latched mouse position, recording it for the cursor."""
+        pos = super().latched_mouse_pos()
+        if self.frame is not None:
+            self.frame["cursor"] = list(pos)
+        return pos
+    
+    def frame_time(self, pacer):
+        """Wait for the next frame; its time is recorded with the frame's events."""
+        self.last_dt = pacer.tick()
+        return self.last_dt
+    
+    def display_changed(self, size):
+        """Mode callback: record the display size a mode change produced."""
+        if self.frame is not None:
+            self.frame.setdefault("display", []).append(list(size))
+    
+    def tier_changed(self, tier):
+        """Tier callback: record a quality tier change on the frame it happened in."""
+        if self.frame is not None:
+            self.frame.setdefault("tier", []).append(tier)
+    
+    def close(self):
+        """Finish the recording."""
+        if not self.file.closed:
+            self.flush_frame()
+            self.file.close()
+
+class InputReplay:
+    """Feeds a recording back into the game loop and times every frame."""
+    
+    def __init__(self, path, realtime=False):
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            header = json.loads(f.readline())
+            self.frames = [json.loads(line) for line in f if line.strip()]
+        if header.get("version") != RECORDING_VERSION:
+            raise ValueError(f"Unsupported recording version: {header.get('version')}")
+        self.seed = header["seed"]
+        self.size = tuple(header["size"])
+        # Display sizes after each recorded mode change, in order
+        self.display_sizes = [tuple(size) for frame in self.frames for size in frame.get("display", [])]
+        # Recordings from before tiers were recorded ran at high
+        recorded_quality = header.get("quality", {"mode": "high", "tier": "high"})
+        self.quality = (recorded_quality["mode"], recorded_quality["tier"])
+        self.realtime = realtime
+        self.index = -1
+        self.frame_start = None
+        self.frame_times = []  # Wall-clock milliseconds spent on each frame
+    
+    @property
+    def current(self):
+        if 0 <= self.index < len(self.frames):
+            return self.frames[self.index]
+        return None
+    
+    @property
+    def finished(self):
+        return self.index >= len(self.frames)
+    
+    def poll(self):
+        """Return the next frame's recorded events, or QUIT once exhausted."""
+        now = time.perf_counter()
+        if self.frame_start is not None:
+            self.frame_times.append((now - self.frame_start) * 1000)
+        self.frame_start = now
+        
+        # Keep the real queue drained so SDL doesn't fill up
+        pygame.event.pump()
+        pygame.event.clear()
+        
+        self.index += 1
+        if self.finished:
+            return [pygame.event.Event(pygame.QUIT)]
+        return [decode_event(e) for e in self.current["events"]]
+    
+    def mouse_pos(self):
+        """Return the recorded mouse position for this frame."""
+        frame = self.current or (self.frames[-1] if self.frames else None)
+        return tuple(frame["mouse"]) if frame else (0, 0)
+    
+    def latched_mouse_pos(self):
+        """Return where the cursor was drawn in this frame."""
+        frame = self.current
+        if frame and "cursor" in frame:
+            return tuple(frame["cursor"])
+        return self.mouse_pos()
+    
+    def recorded_tiers(self):
+        """Return the quality tiers this frame switched to when it was recorded."""
+        frame = self.current
+        return frame.get("tier", []) if frame else []
+    
+    def frame_time(self, pacer):
+        """Return the next frame's recorded time, sleeping it off in real-time mode."""
+        # Frame time is taken before the frame's events are polled
+        upcoming = self.index + 1
+        dt = self.frames[upcoming]["dt"] if upcoming < len(self.frames) else pacer.interval or 1.0 / 60
+        if self.realtime and self.frame_start is not None:
+            remaining = dt - (time.perf_counter() - self.frame_start)
+            if remaining > 0:
+                time.sleep(remaining)
+        return dt
+    
+    def stats(self):
+        """Summarize the measured frame times in milliseconds."""
+        times = sorted(self.frame_times)
+        if not times:
+            return {}
+        
+        def percentile(p):
+            return times[min(len(times) - 1, int(p / 100 * len(times)))]
+        
+        return {
+            "frames": len(times),
+            "mean": sum(times) / len(times),
+            "p50": percentile(50),
+            "p95": percentile(95),
+            "p99": percentile(99),
+            "max": times[-1],
+        }
+    
+    def write_timings(self, path):
+        """Write per-frame timings as CSV."""
+        with open(path, "w") as f:
+            f.write("frame,ms\n")
+            for i, ms in enumerate(self.frame_times):
+                f.write(f"{i},{ms:.3f}\n")
+    
+    def close(self):
+        """Print a timing summary for the replay."""
+        stats = self.stats()
+        if stats:
+            print("Replay frame times (ms): " + ", ".join(
+                f"{k}={v:.2f}" if isinstance(v, float) else f"{k}={v}"
+                for k, v in stats.items()))
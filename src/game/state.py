@@ -1,6 +1,9 @@
 """
 Game state management.
 """
+import copy
+import hashlib
+import json
 
 class GameState:
     """Manages the overall game state."""
@@ -18,15 +21,23 @@ class GameState:
     
     def load_game(self, save_id):
         """Load a saved game."""
-        # This would load game data from a file
+        # This would load game data from a file; for now saves live in memory
         print(f"Loading game save: {save_id}")
+        saved = self.save_data.get(save_id)
+        if saved is not None:
+            self.player = copy.deepcopy(saved["player"])
+            self.game_world = copy.deepcopy(saved["game_world"])
         # Set current state to gameplay
         self.current_state = "gameplay"
     
     def save_game(self, save_id):
         """Save the current game state."""
-        # This would save game data to a file
+        # This would save game data to a file; for now saves live in memory
         print(f"Saving game as: {save_id}")
+        self.save_data[save_id] = {
+            "player": copy.deepcopy(self.player),
+            "game_world": copy.deepcopy(self.game_world),
+        }
     
     def new_game(self):
         """Start a new game."""
@@ -40,4 +51,15 @@ class GameState:
     def exit_game(self):
         """Clean up and exit the game."""
         # Save any unsaved data, clean up resources, etc.
-        print("Exiting game")
\ No newline at end of file
+        print("Exiting game")
+    
+    def checksum(self):
+        """Return a short digest of the game state, for comparing runs."""
+        state = {
+            "current_state": self.current_state,
+            "player": self.player,
+            "game_world": self.game_world,
+            "save_data": self.save_data,
+        }
+        data = json.dumps(state, sort_keys=True, default=repr)
+        return hashlib.sha256(data.encode("utf-8")).hexdigest()[:16]
@@ -0,0 +1,36 @@
+"""
+Fixed-timestep simulation clock.
+"""
+
+class FixedTimestep:
+    """Turns variable frame times into a whole number of fixed simulation steps."""
+    
+    def __init__(self, rate=60, max_steps=5):
+        self.rate = rate
+        self.step = 1.0 / rate
+        self.max_steps = max_steps
+        self.accumulator = 0.0
+        self.alpha = 0.0
+        self.dropped_time = 0.0
+    
+    def reset(self):
+        """Discard any accumulated time, e.g. when a scene becomes active."""
+        self.accumulator = 0.0
+        self.alpha = 0.0
+    
+    def advance(self, frame_time):
+        """Add elapsed seconds and return how many fixed steps to simulate."""
+        self.accumulator += frame_time
+        steps = int(self.accumulator / self.step)
+        
+        if steps > self.max_steps:
+            # Too far behind: drop the backlog instead of spiralling
+            self.dropped_time += (steps - self.max_steps) * self.step
+            steps = self.max_steps
+            self.accumulator %= self.step
+        else:
+            self.accumulator -= steps * self.step
+        
+        # Fraction of a step left over, used to interpolate rendering
+        self.alpha = self.accumulator / self.step
+        return steps
@@ -0,0 +1,208 @@
+"""
+Surface memory accounting.
+
+Long-lived surfaces and surface caches register with a MemoryTracker so the
+game can report how much pixel memory it holds and stay within a budget.
+Cache entries remember the frame they were last used in, and only entries
+from earlier frames are evicted; if the current frame's working set alone
+is over budget, the budget is exceeded rather than rebuilding it every frame.
+"""
+from collections import OrderedDict
+
+def surface_bytes(surface):
+    """Return the pixel memory used by a surface."""
+    return surface.get_pitch() * surface.get_height()
+
+class SurfaceCache:
+    """LRU cache of surfaces whose size is accounted for by a MemoryTracker."""
+    
+    def __init__(self, owner, tracker=None):
+        self.owner = owner
+        self.tracker = tracker
+        self.entries = OrderedDict()
+        self.last_used = {}  # key -> frame the entry was last used in
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        if tracker:
+            tracker.register_cache(self)
+    
+    @property
+    def frame(self):
+        return self.tracker.frame if self.tracker else 0
+    
+    def get(self, key, build):
+        """Return the cached surface for key, calling build() on a miss."""
+        surface = self.entries.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            self.last_used[key] = self.frame
+            return surface
+        
+        self.misses += 1
+        surface = build()
+        self.entries[key] = surface
+        self.last_used[key] = self.frame
+        self.bytes += surface_bytes(surface)
+        if self.tracker:
+            self.tracker.enforce_budget()
+        return surface
+    
+    def evictable(self):
+        """Whether the least recently used entry is from an earlier frame."""
+        if not self.entries:
+            return False
+        return self.last_used[next(iter(self.entries))] < self.frame
+    
+    def evict_oldest(self):
+        """Drop the least recently used entry and return its size."""
+        key, surface = self.entries.popitem(last=False)
+        del self.last_used[key]
+        size = surface_bytes(surface)
+        self.bytes -= size
+        if self.tracker:
+            self.tracker.notify_evicted(self.owner, key, size, surface)
+        return size
+    
+    def evict_where(self, predicate):
+        """Drop every entry whose key matches predicate and return the bytes freed."""
+        freed = 0
+        for key in [k for k in self.entries if predicate(k)]:
+            surface = self.entries.pop(key)
+            del self.last_used[key]
+            size = surface_bytes(surface)
+            self.bytes -= size
+            freed += size
+            if self.tracker:
+                self.tracker.notify_evicted(self.owner, key, size, surface)
+        return freed
+    
+    def clear(self):
+        """Drop every entry."""
+        self.entries.clear()
+        self.last_used.clear()
+        self.bytes = 0
+    
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+class MemoryTracker:
+    """Tracks long-lived surfaces and caches against a global byte budget."""
+    
+    def __init__(self, budget=None):
+        self.budget = budget
+        self.surfaces = {}  # (owner, name) -> (surface, on_evict)
+        self.caches = []
+        self.eviction_callbacks = []
+        self.show_readout = False
+        self.frame = 0  # Counts frames, so entries in use this frame aren't evicted
+        self.warned_bytes = 0  # Working set size at the last over-budget warning
+    
+    def begin_frame(self):
+        """Start a new frame; entries used in earlier frames become evictable."""
+        self.frame += 1
+    
+    def track(self, owner, name, surface, on_evict=None):
+        """Account for a long-lived surface and return it.
+        
+        Surfaces with an on_evict callback may be dropped to meet the budget;
+        the callback is expected to release or lazily rebuild the surface.
+        """
+        if surface is not None:
+            self.surfaces[(owner, name)] = (surface, on_evict)
+            self.enforce_budget()
+        return surface
+    
+    def untrack(self, owner, name):
+        """Stop accounting for a surface."""
+        self.surfaces.pop((owner, name), None)
+    
+    def register_cache(self, cache):
+        """Account for a SurfaceCache."""
+        self.caches.append(cache)
+    
+    def add_eviction_callback(self, callback):
+        """Call callback(owner, name, bytes, surface) whenever something is evicted."""
+        self.eviction_callbacks.append(callback)
+    
+    def notify_evicted(self, owner, name, size, surface=None):
+        for callback in self.eviction_callbacks:
+            callback(owner, name, size, surface)
+    
+    @property
+    def total_bytes(self):
+        surfaces = sum(surface_bytes(s) for s, _ in self.surfaces.values())
+        return surfaces + sum(cache.bytes for cache in self.caches)
+    
+    def enforce_budget(self):
+        """Evict cache entries, then evictable surfaces, until under budget.
+        
+        Cache entries used in the current frame are never evicted, since
+        they would only be rebuilt for the next one.
+        """
+        if self.budget is None:
+            return
+        total = self.total_bytes
+        
+        # Least-used caches give up their oldest entries first
+        for cache in sorted(self.caches, key=lambda c: c.hit_rate):
+            while total > self.budget and cache.evictable():
+                total -= cache.evict_oldest()
+        
+        for key in list(self.surfaces):
+            if total <= self.budget:
+                break
+            surface, on_evict = self.surfaces[key]
+            if on_evict is None:
+                continue
+            del self.surfaces[key]
+            size = surface_bytes(surface)
+            total -= size
+            on_evict()
+            self.notify_evicted(key[0], key[1], size, surface)
+        
+        # What's left is in use; let it grow rather than thrash, but say so
+        # (again only once it has grown by a quarter)
+        if total > self.budget and total > self.warned_bytes * 1.25:
+            mb = 1024 * 1024
+            print(f"Warning: Surfaces in use need {total / mb:.1f} MB, "
+                  f"over the {self.budget / mb:.0f} MB budget")
+            self.warned_bytes = total
+    
+    def snapshot(self):
+        """Return the current accounting as plain data."""
+        return {
+            "budget": self.budget,
+            "total_bytes": self.total_bytes,
+            "surfaces": [
+                {"owner": owner, "name": name, "size": surface.get_size(),
+                 "bytes": surface_bytes(surface), "evictable": on_evict is not None}
+                for (owner, name), (surface, on_evict) in self.surfaces.items()
+            ],
+            "caches": [
+                {"owner": cache.owner, "entries": len(cache.entries), "bytes": cache.bytes,
+                 "hits": cache.hits, "misses": cache.misses, "hit_rate": cache.hit_rate}
+                for cache in self.caches
+            ],
+        }
+    
+    def draw_readout(self, renderer, font, pos, color):
+        """Draw a short memory summary at pos through a render backend."""
+        mb = 1024 * 1024
+        budget = f"{self.budget / mb:.0f}" if self.budget is not None else "-"
+        lines = [f"Surfaces: {self.total_bytes / mb:.1f} / {budget} MB"]
+        for cache in self.caches:
+            lines.append(f"{cache.owner}: {len(cache.entries)} entries, "
+                         f"{cache.bytes / mb:.1f} MB, {cache.hit_rate:.0%} hits")
+        
+        x, y = pos
+        for line in lines:
+            text = font.render(line, True, color)
+            renderer.blit(text, (x, y))
+            y += text.get_height() + 2
+
+# Shared tracker for the whole game
+tracker = MemoryTracker()
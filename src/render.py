@@ -0,0 +1,341 @@
+"""
+Render backends.
+
+Screens draw by blitting surfaces through a backend instead of onto the
+display surface directly. The surface backend is plain software blitting;
+the texture backend uploads each surface once as an SDL texture and draws
+it with per-draw alpha and color modulation. Uploaded textures count
+against the surface memory budget, and a texture is released as soon as
+its surface is evicted from a cache. The headless backend blits like
+the surface backend but into an off-screen surface, with no window at all.
+
+Fullscreen uses the desktop resolution, so the display size can change at
+runtime; backends report that to their resize callbacks. A replay pins the
+display to the sizes its recording had, since the desktop resolution
+differs from machine to machine.
+"""
+from collections import OrderedDict, deque
+import pygame
+
+from src.compositor import BandedCompositor
+
+# SDL_BlendMode values
+BLENDMODE_NONE = 0
+BLENDMODE_BLEND = 1
+
+class DisplayBackend:
+    """Tracks the display size and tells interested parties when it changes."""
+    
+    def __init__(self, size):
+        self.size = tuple(size)
+        self.windowed_size = tuple(size)
+        self.resize_callbacks = []
+        self.mode_callbacks = []
+        self.pinned_sizes = None  # Sizes for upcoming mode changes while replaying
+    
+    def add_resize_callback(self, callback):
+        """Call callback(old_size, new_size) whenever the display size changes."""
+        self.resize_callbacks.append(callback)
+    
+    def add_mode_callback(self, callback):
+        """Call callback(size) after every mode change, even one that keeps the size."""
+        self.mode_callbacks.append(callback)
+    
+    def pin_sizes(self, size, changes):
+        """Replay display sizes from a recording instead of using the real display modes.
+        
+        The display starts windowed at size, and each later mode change takes
+        the next size from changes, so the layout matches the recording.
+        """
+        self.pinned_sizes = deque(tuple(s) for s in changes)
+        if tuple(size) != self.size:
+            self.resized(self.switch_mode(False, size))
+    
+    def set_fullscreen(self, fullscreen):
+        """Switch between fullscreen at the desktop resolution and windowed mode."""
+        if self.pinned_sizes is not None:
+            # Replaying: use the size the recording had, whatever this display would give
+            size = self.pinned_sizes.popleft() if self.pinned_sizes else self.size
+            size = self.switch_mode(False, size)
+        else:
+            size = self.switch_mode(fullscreen)
+        self.resized(size)
+        for callback in self.mode_callbacks:
+            callback(self.size)
+    
+    def resized(self, size):
+        """Record the display's current size, notifying callbacks if it changed."""
+        size = tuple(size)
+        old = self.size
+        if size == old:
+            return
+        self.size = size
+        print(f"Display size changed: {old[0]}x{old[1]} -> {size[0]}x{size[1]}")
+        for callback in self.resize_callbacks:
+            callback(old, size)
+
+class TextureCache:
+    """LRU cache of uploaded textures, accounted for by a MemoryTracker like a SurfaceCache."""
+    
+    def __init__(self, owner, max_entries, tracker=None):
+        self.owner = owner
+        self.max_entries = max_entries
+        self.tracker = tracker
+        self.entries = OrderedDict()  # id(surface) -> (surface, texture)
+        self.last_used = {}  # id(surface) -> frame the texture was last drawn in
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        if tracker:
+            tracker.register_cache(self)
+            tracker.add_eviction_callback(self.surface_evicted)
+    
+    @property
+    def frame(self):
+        return self.tracker.frame if self.tracker else 0
+    
+    def find(self, source):
+        """Return the texture uploaded for source, or None."""
+        entry = self.entries.get(id(source))
+        if entry is not None and entry[0] is source:
+            return entry[1]
+        return None
+    
+    def get(self, source, upload):
+        """Return the texture for source, calling upload(source) on a miss."""
+        texture = self.find(source)
+        if texture is not None:
+            self.hits += 1
+            self.entries.move_to_end(id(source))
+            self.last_used[id(source)] = self.frame
+            return texture
+        
+        self.misses += 1
+        texture = upload(source)
+        # Holding the surface keeps its id from being reused by another one
+        self.entries[id(source)] = (source, texture)
+        self.last_used[id(source)] = self.frame
+        self.bytes += texture_bytes(texture)
+        if len(self.entries) > self.max_entries:
+            self.evict_oldest()
+        if self.tracker:
+            self.tracker.enforce_budget()
+        return texture
+    
+    def evictable(self):
+        """Whether the least recently used texture is from an earlier frame."""
+        if not self.entries:
+            return False
+        return self.last_used[next(iter(self.entries))] < self.frame
+    
+    def evict_oldest(self):
+        """Drop the least recently used texture and return its size."""
+        key, (source, texture) = self.entries.popitem(last=False)
+        del self.last_used[key]
+        size = texture_bytes(texture)
+        self.bytes -= size
+        return size
+    
+    def release(self, source):
+        """Drop source's texture, if it has one."""
+        if self.find(source) is not None:
+            _, texture = self.entries.pop(id(source))
+            del self.last_used[id(source)]
+            self.bytes -= texture_bytes(texture)
+    
+    def surface_evicted(self, owner, name, size, surface):
+        """Eviction callback: a surface nobody draws any more shouldn't keep its texture."""
+        if surface is not None and owner != self.owner:
+            self.release(surface)
+    
+    def clear(self):
+        """Drop every texture."""
+        self.entries.clear()
+        self.last_used.clear()
+        self.bytes = 0
+    
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+def texture_bytes(texture):
+    """Return the memory used by a 32-bit texture."""
+    return texture.width * texture.height * 4
+
+class SurfaceBackend(DisplayBackend):
+    """Blits onto the display surface and flips it."""
+    
+    name = "surface"
+    vsync = False
+    
+    def __init__(self, size, caption, threads=1):
+        super().__init__(size)
+        self.screen = pygame.display.set_mode(size)
+        pygame.display.set_caption(caption)
+        self.compositor = BandedCompositor(threads)
+    
+    def begin_frame(self):
+        """Start a new frame; screens repaint everything, so nothing to clear."""
+        pass
+    
+    def blit(self, source, dest, alpha=None, color=None, area=None):
+        """Draw source at dest, optionally modulated by alpha and an RGB color."""
+        if color is not None:
+            source = source.copy()
+            source.fill(color, special_flags=pygame.BLEND_RGB_MULT)
+        if alpha is not None:
+            source.set_alpha(alpha)
+            self.screen.blit(source, dest, area)
+            source.set_alpha(None)
+        else:
+            self.screen.blit(source, dest, area)
+    
+    def prepare(self, source):
+        """Get source ready to draw; software blits need no preparation."""
+        pass
+    
+    def compose(self, layers):
+        """Blit a stack of full-screen (surface, dest) layers, banded across threads."""
+        self.compositor.compose(self.screen, layers)
+    
+    def invalidate(self, source):
+        """Note that source's pixels changed; blits always read them fresh."""
+        pass
+    
+    def switch_mode(self, fullscreen, size=None):
+        """Go fullscreen, or windowed at size (the windowed size by default); return the new size."""
+        if fullscreen:
+            self.screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
+        else:
+            self.screen = pygame.display.set_mode(size or self.windowed_size)
+        return self.screen.get_size()
+    
+    def read_pixels(self):
+        """Return the current frame as a surface."""
+        return self.screen
+    
+    def present(self):
+        """Show the finished frame."""
+        pygame.display.flip()
+
+class TextureBackend(DisplayBackend):
+    """Draws surfaces as cached SDL textures through a pygame._sdl2 Renderer."""
+    
+    name = "texture"
+    
+    def __init__(self, size, caption, software=False, vsync=False, max_textures=256, tracker=None):
+        from pygame._sdl2.video import Window, Renderer, Texture
+        super().__init__(size)
+        self.Texture = Texture
+        self.screen = None
+        self.window = Window(caption, size=size)
+        # accelerated=0 asks SDL for its software renderer, which works headless
+        self.renderer = Renderer(self.window, accelerated=0 if software else -1, vsync=vsync)
+        self.vsync = vsync
+        self.textures = TextureCache("textures", max_textures, tracker)
+        self.uploads = 0
+    
+    def upload(self, source):
+        """Upload source as a new texture."""
+        self.uploads += 1
+        return self.Texture.from_surface(self.renderer, source)
+    
+    def texture(self, source):
+        """Return the texture for source, uploading it on first use."""
+        return self.textures.get(source, self.upload)
+    
+    def prepare(self, source):
+        """Upload source ahead of its first draw."""
+        self.texture(source)
+    
+    def begin_frame(self):
+        """Clear the render target."""
+        self.renderer.draw_color = (0, 0, 0, 255)
+        self.renderer.clear()
+    
+    def blit(self, source, dest, alpha=None, color=None, area=None):
+        """Draw source at dest, optionally modulated by alpha and an RGB color."""
+        texture = self.texture(source)
+        # Blending is expensive, especially in the software renderer, so opaque
+        # surfaces only blend when they are being faded
+        blend = alpha is not None or source.get_flags() & pygame.SRCALPHA
+        texture.blend_mode = BLENDMODE_BLEND if blend else BLENDMODE_NONE
+        texture.alpha = 255 if alpha is None else alpha
+        texture.color = (255, 255, 255) if color is None else color
+        x, y = int(dest[0]), int(dest[1])
+        if area is not None:
+            area = pygame.Rect(area)
+            texture.draw(srcrect=area, dstrect=(x, y, area.width, area.height))
+        else:
+            texture.draw(dstrect=(x, y, texture.width, texture.height))
+    
+    def compose(self, layers):
+        """Draw a stack of full-screen (surface, dest) layers."""
+        for source, dest in layers:
+            self.blit(source, dest)
+    
+    def invalidate(self, source):
+        """Re-upload source's pixels the next time it is drawn."""
+        texture = self.textures.find(source)
+        if texture is not None:
+            texture.update(source)
+            self.uploads += 1
+    
+    def switch_mode(self, fullscreen, size=None):
+        """Go fullscreen, or windowed at size (the windowed size by default); return the new size."""
+        if fullscreen:
+            self.window.set_fullscreen(desktop=True)
+        else:
+            self.window.set_windowed()
+            self.window.size = size or self.windowed_size
+        return self.window.size
+    
+    def read_pixels(self):
+        """Return the current frame as a surface."""
+        return self.renderer.to_surface()
+    
+    def present(self):
+        """Show the finished frame."""
+        self.renderer.present()
+
+class HeadlessBackend(SurfaceBackend):
+    """Blits onto an off-screen surface; nothing is ever shown."""
+    
+    name = "headless"
+    
+    def __init__(self, size, caption=None, threads=1):
+        DisplayBackend.__init__(self, size)
+        self.screen = pygame.Surface(size)
+        self.compositor = BandedCompositor(threads)
+    
+    def switch_mode(self, fullscreen, size=None):
+        """There's no window; only a pinned size changes the off-screen surface."""
+        if size is not None and tuple(size) != self.screen.get_size():
+            self.screen = pygame.Surface(size)
+        return self.screen.get_size()
+    
+    def present(self):
+        """Nothing to show the frame on."""
+        pass
+
+BACKENDS = ("surface", "texture", "texture-software", "headless")
+
+def create_backend(name, size, caption, threads=1, vsync=False, tracker=None):
+    """Create the render backend called name.
+    
+    threads sets how many compositor threads the surface backend uses for
+    full-screen layers; vsync asks the texture backends to present in step
+    with the display; tracker is the MemoryTracker textures are accounted to.
+    """
+    if name == "surface":
+        if vsync:
+            print("Warning: vsync needs a texture backend; the surface backend presents without it")
+        return SurfaceBackend(size, caption, threads)
+    if name == "texture":
+        return TextureBackend(size, caption, vsync=vsync, tracker=tracker)
+    if name == "texture-software":
+        return TextureBackend(size, caption, software=True, vsync=vsync, tracker=tracker)
+    if name == "headless":
+        return HeadlessBackend(size, caption, threads)
+    raise ValueError(f"Unknown render backend {name!r}, expected one of {', '.join(BACKENDS)}")
@@ -2,6 +2,14 @@
 UI components for the game.
 """
 from src.ui.button import Button
-from src.ui.effects import particle_effect, draw_decorative_frame, create_ambient_particles, update_ambient_particles
+from src.ui.events import EventDispatcher, coalesce_motion
+from src.ui.tween import tweens, TweenEngine, Tween
+from src.ui.layout import Layout
+from src.ui.quality import quality, QualityManager, TIERS, MODES
+from src.ui.effects import (
+    seed_effects, get_panel, get_backdrop, get_framed_panel, get_shadowed_text, get_circle_sprite,
+    particle_effect, draw_decorative_frame, create_ambient_particles, update_ambient_particles, draw_ambient_particles,
+    resize_ambient_particles, rescale_ambient_particles, drop_display_caches, draw_cursor
+)
 from src.ui.menu import MainMenu
 from src.ui.settings_menu import SettingsMenu
\ No newline at end of file
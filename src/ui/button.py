@@ -1,14 +1,32 @@
 """
 Button class for the UI.
 """
-import math
 import pygame
 import sys
 import os
 
 # Add the root directory to the path so we can import config
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
-from config import GOLD, DARK_GOLD, MENU_FONT, BUTTON_SOUND, SCREEN
+from config import GOLD, DARK_GOLD, MENU_FONT, BUTTON_SOUND, RENDERER, SURFACE_MEMORY
+from src.ui.tween import tweens, ease_out_quad
+from src.ui.effects import sprite_cache, get_shadowed_text, particle_effect
+from src.ui.quality import quality
+
+# Seconds for the hover color transition
+COLOR_TRANSITION_TIME = 0.4
+
+# Rune sprite size; the rune is centered in it
+RUNE_SIZE = (20, 24)
+
+def get_rune_sprite():
+    """Return the decorative rune drawn beside hovered buttons."""
+    def build():
+        sprite = pygame.Surface(RUNE_SIZE, pygame.SRCALPHA)
+        cx, cy = RUNE_SIZE[0] // 2, RUNE_SIZE[1] // 2
+        pygame.draw.circle(sprite, GOLD, (cx, cy), 8)
+        pygame.draw.line(sprite, GOLD, (cx, cy - 10), (cx, cy + 10), 2)
+        return sprite
+    return sprite_cache.get(("rune",), build)
 
 class Button:
     """Interactive button with visual effects."""
@@ -24,75 +42,91 @@ class Button:
         self.rect = pygame.Rect(pos[0], pos[1], size[0], size[1])
         self.shadow_rect = pygame.Rect(pos[0] + shadow_offset, pos[1] + shadow_offset, size[0], size[1])
         self.is_hovered = False
-        self.was_hovered = False
-        self.pulse_counter = 0
+        self.build_surfaces()
+    
+    def build_surfaces(self):
+        """Create the button's surfaces at its current size."""
+        size = self.size
         self.glow_surface = pygame.Surface((size[0] + 20, size[1] + 20), pygame.SRCALPHA)
+        
+        # Reused every frame instead of allocating temporary surfaces
+        self.shadow_surface = pygame.Surface((size[0], size[1]), pygame.SRCALPHA)
+        pygame.draw.rect(self.shadow_surface, self.darker_red_with_alpha(), 
+                        pygame.Rect(0, 0, size[0], size[1]), 
+                        border_radius=12)
+        self.button_surface = pygame.Surface((size[0], size[1]), pygame.SRCALPHA)
+        self.face_dirty = True
+        
+        self.label_surface = pygame.Surface((size[0], size[1]), pygame.SRCALPHA)
+        
+        # Glow and label only change with the quality tier
+        self.quality_version = None
+        self.paint_quality_sprites()
+        
+        owner = f"Button '{self.text}'"
+        SURFACE_MEMORY.track(owner, "glow", self.glow_surface)
+        SURFACE_MEMORY.track(owner, "shadow", self.shadow_surface)
+        SURFACE_MEMORY.track(owner, "face", self.button_surface)
+        SURFACE_MEMORY.track(owner, "label", self.label_surface)
     
-    def draw(self, surface):
+    def place(self, rect):
+        """Move the button to rect, rebuilding its surfaces only if its size changed."""
+        if tuple(rect.size) != tuple(self.size):
+            self.size = rect.size
+            self.build_surfaces()
+        self.pos = rect.topleft
+        self.rect = pygame.Rect(rect)
+        self.shadow_rect = self.rect.move(self.shadow_offset, self.shadow_offset)
+    
+    def paint_quality_sprites(self):
+        """Repaint the glow and label for the current quality tier."""
+        preset = quality.preset
+        
+        # Each ring overwrites the one inside it, so the glow never changes; draw it once
+        self.glow_surface.fill((0, 0, 0, 0))
+        for i in range(preset["glow_rings"]):
+            pygame.draw.rect(self.glow_surface, (255, 215, 0, 5), 
+                           pygame.Rect(10-i, 10-i, self.size[0]+(i*2), self.size[1]+(i*2)), 
+                           border_radius=12)
+        
+        # Border and text never change, so render them once
+        self.label_surface.fill((0, 0, 0, 0))
+        pygame.draw.rect(self.label_surface, DARK_GOLD, self.label_surface.get_rect(), width=2, border_radius=12)
+        text_surf, text_pos = get_shadowed_text(MENU_FONT, self.text, GOLD, DARK_GOLD, 
+                                                [(2, 2), (1, 1), (2, 1), (1, 2)][:preset["text_shadows"]],
+                                                center=self.label_surface.get_rect().center)
+        self.label_surface.blit(text_surf, text_pos)
+        RENDERER.invalidate(self.glow_surface)
+        RENDERER.invalidate(self.label_surface)
+        self.quality_version = quality.version
+    
+    def draw(self, renderer):
         """Draw the button with all visual effects."""
+        if self.quality_version != quality.version:
+            self.paint_quality_sprites()
+        
         # Draw glow effect when hovered
         if self.is_hovered:
-            # Create glow surface
-            alpha = int(abs(math.sin(self.pulse_counter * 0.1)) * 100) + 50
-            self.glow_surface.fill((0, 0, 0, 0))  # Reset with transparency
-            glow_rect = pygame.Rect(10, 10, self.size[0], self.size[1])
-            pygame.draw.rect(self.glow_surface, (255, 215, 0, alpha), glow_rect, border_radius=12)
-            
-            # Apply blur by drawing multiple transparent rects
-            for i in range(10):
-                pygame.draw.rect(self.glow_surface, (255, 215, 0, 5), 
-                               pygame.Rect(10-i, 10-i, self.size[0]+(i*2), self.size[1]+(i*2)), 
-                               border_radius=12)
-            
-            # Blit the glow
-            surface.blit(self.glow_surface, (self.pos[0]-10, self.pos[1]-10))
+            renderer.blit(self.glow_surface, (self.pos[0]-10, self.pos[1]-10))
         
         # Draw shadow with transparency
-        shadow_surface = pygame.Surface((self.size[0], self.size[1]), pygame.SRCALPHA)
-        pygame.draw.rect(shadow_surface, self.darker_red_with_alpha(), 
-                        pygame.Rect(0, 0, self.size[0], self.size[1]), 
-                        border_radius=12)
-        surface.blit(shadow_surface, (self.pos[0] + self.shadow_offset, self.pos[1] + self.shadow_offset))
-        
-        # Draw main button with transparency
-        button_surface = pygame.Surface((self.size[0], self.size[1]), pygame.SRCALPHA)
-        pygame.draw.rect(button_surface, self.current_color, 
-                        pygame.Rect(0, 0, self.size[0], self.size[1]), 
-                        border_radius=12)
-        surface.blit(button_surface, self.pos)
-        
-        # Add a subtle border
-        pygame.draw.rect(surface, DARK_GOLD, self.rect, width=2, border_radius=12)
+        renderer.blit(self.shadow_surface, (self.pos[0] + self.shadow_offset, self.pos[1] + self.shadow_offset))
         
-        # Render text with better glow effect
-        text_surf = MENU_FONT.render(self.text, True, GOLD)
-        text_rect = text_surf.get_rect(center=self.rect.center)
+        # Draw main button with transparency, redrawing the face only while its color changes
+        if self.face_dirty:
+            self.paint_face()
+            renderer.invalidate(self.button_surface)
+        renderer.blit(self.button_surface, self.pos)
         
-        # Add multiple shadow layers for better glow effect
-        for offset in [(2, 2), (1, 1), (2, 1), (1, 2)]:
-            shadow_surf = MENU_FONT.render(self.text, True, DARK_GOLD)
-            shadow_rect = shadow_surf.get_rect(center=(text_rect.centerx + offset[0], text_rect.centery + offset[1]))
-            surface.blit(shadow_surf, shadow_rect)
-        
-        # Draw main text
-        surface.blit(text_surf, text_rect)
+        # Border and text
+        renderer.blit(self.label_surface, self.pos)
         
         # Add decorative runes to the sides of the button when hovered
         if self.is_hovered:
-            rune_color = GOLD
-            rune_size = 8
-            
-            # Left side rune
-            pygame.draw.circle(surface, rune_color, (self.rect.left - 15, self.rect.centery), rune_size)
-            pygame.draw.line(surface, rune_color, 
-                           (self.rect.left - 15, self.rect.centery - 10),
-                           (self.rect.left - 15, self.rect.centery + 10), 2)
-            
-            # Right side rune
-            pygame.draw.circle(surface, rune_color, (self.rect.right + 15, self.rect.centery), rune_size)
-            pygame.draw.line(surface, rune_color, 
-                           (self.rect.right + 15, self.rect.centery - 10),
-                           (self.rect.right + 15, self.rect.centery + 10), 2)
+            rune = get_rune_sprite()
+            half_w, half_h = RUNE_SIZE[0] // 2, RUNE_SIZE[1] // 2
+            renderer.blit(rune, (self.rect.left - 15 - half_w, self.rect.centery - half_h))
+            renderer.blit(rune, (self.rect.right + 15 - half_w, self.rect.centery - half_h))
     
     def darker_red_with_alpha(self):
         """Return darker red with proper alpha."""
@@ -100,45 +134,54 @@ class Button:
         from config import DARKER_RED
         return (DARKER_RED[0], DARKER_RED[1], DARKER_RED[2], DARKER_RED[3])
     
+    def paint_face(self):
+        """Repaint the button face in its current color."""
+        self.button_surface.fill((0, 0, 0, 0))
+        pygame.draw.rect(self.button_surface, self.current_color, 
+                        pygame.Rect(0, 0, self.size[0], self.size[1]), 
+                        border_radius=12)
+        self.face_dirty = False
+    
+    def prewarm(self):
+        """Paint the face if needed and yield every surface the button draws."""
+        if self.face_dirty:
+            self.paint_face()
+        if self.quality_version != quality.version:
+            self.paint_quality_sprites()
+        yield self.glow_surface
+        yield self.shadow_surface
+        yield self.button_surface
+        yield self.label_surface
+        yield get_rune_sprite()
+    
+    def mark_dirty(self):
+        """Flag the button face for redrawing."""
+        self.face_dirty = True
+    
     def update(self, mouse_pos, time_passed):
-        """Update button state based on mouse position."""
+        """Update button state based on mouse position.
+        
+        Color transitions are handed to the tween engine when the hover state
+        changes, so a button at rest does no per-frame work here.
+        """
         previous_hover = self.is_hovered
+        self.is_hovered = self.rect.collidepoint(mouse_pos)
         
-        if self.rect.collidepoint(mouse_pos):
-            # Smoother transition effect when hovering
-            target_color = self.hover_color
-            current = pygame.Color(self.current_color[0], self.current_color[1], 
-                                 self.current_color[2], self.current_color[3])
-            target = pygame.Color(target_color[0], target_color[1], 
-                                target_color[2], target_color[3])
-            
-            # Interpolate color values for smoother transition
-            self.current_color = current.lerp(target, 0.1)
-            self.is_hovered = True
-            self.pulse_counter += time_passed
+        if self.is_hovered != previous_hover:
+            # Smooth transition towards the hover or normal color
+            target_color = self.hover_color if self.is_hovered else self.color
+            tweens.to(self, "current_color", target_color, COLOR_TRANSITION_TIME,
+                      ease_out_quad, on_change=self.mark_dirty)
             
             # Play sound when first hovering
-            if not previous_hover and BUTTON_SOUND:
+            if self.is_hovered and BUTTON_SOUND:
                 BUTTON_SOUND.play()
-        else:
-            # Smooth transition back to normal color
-            target_color = self.color
-            current = pygame.Color(self.current_color[0], self.current_color[1], 
-                                 self.current_color[2], self.current_color[3])
-            target = pygame.Color(target_color[0], target_color[1], 
-                                target_color[2], target_color[3])
-            
-            self.current_color = current.lerp(target, 0.1)
-            self.is_hovered = False
         
     def handle_event(self, event):
         """Handle mouse events on the button."""
         if event.type == pygame.MOUSEBUTTONDOWN and self.is_hovered:
-            # Import here to avoid circular imports
-            from src.ui.effects import particle_effect
-            
             # Create particles when clicked
-            particle_effect(SCREEN, (self.rect.centerx, self.rect.centery), GOLD, 3, 15)
+            particle_effect(RENDERER, (self.rect.centerx, self.rect.centery), GOLD, 3, 15)
             
             # Play a different sound for click
             if BUTTON_SOUND:
@@ -9,16 +9,127 @@ import os
 
 # Add the root directory to the path so we can import config
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
-from config import WIDTH, HEIGHT, GOLD, SCREEN
+from config import GOLD, SURFACE_MEMORY, RENDERER, BACKGROUND_IMG, CURSOR_IMG, LATE_LATCH_CURSOR
+from src.memory import SurfaceCache
+from src.game.input import get_mouse_pos, latch_mouse_pos
 
-def particle_effect(surface, pos, color, size, num_particles=8):
+# Random source for all effects, seeded when recording or replaying input
+rng = random.Random()
+
+def seed_effects(seed):
+    """Seed the effects RNG so particle layouts can be reproduced."""
+    rng.seed(seed)
+
+# Shared translucent fills, so screens don't each hold their own copies
+panel_cache = SurfaceCache("panels", SURFACE_MEMORY)
+
+# Small pre-rendered pieces (particles, ornaments, rendered text) that
+# screens blit instead of drawing primitives every frame
+sprite_cache = SurfaceCache("sprites", SURFACE_MEMORY)
+
+# Room left around a framed panel for the corner embellishments
+FRAME_MARGIN = 8
+
+def get_panel(size, color):
+    """Return a cached surface of the given size filled with an RGBA color."""
+    def build():
+        panel = pygame.Surface(size, pygame.SRCALPHA)
+        panel.fill(color)
+        return panel
+    return panel_cache.get((tuple(size), tuple(color)), build)
+
+def get_backdrop(size):
+    """Return the background image at size, or a cached dark gradient if it's missing."""
+    if BACKGROUND_IMG:
+        if BACKGROUND_IMG.get_size() == size:
+            return BACKGROUND_IMG
+        return panel_cache.get(("backdrop", size), lambda: pygame.transform.smoothscale(BACKGROUND_IMG, size))
+    
+    def build():
+        width, height = size
+        gradient = pygame.Surface(size)
+        for y in range(height):
+            # Create a dark gradient
+            color_value = max(0, min(50, 50 - (y / height) * 50))
+            pygame.draw.line(gradient, (color_value, color_value, color_value * 0.8), 
+                           (0, y), (width, y))
+        return gradient
+    return panel_cache.get(("gradient", size), build)
+
+def drop_display_caches(old_size, new_size):
+    """Drop cached surfaces built for a display size that's no longer in use.
+    
+    Size-dependent entries (backdrop, full-screen overlays, dividers, panels
+    sized by the layout) have the display size in their key; everything else
+    is left alone.
+    """
+    for cache in (panel_cache, sprite_cache):
+        cache.evict_where(lambda key: old_size in key)
+
+RENDERER.add_resize_callback(drop_display_caches)
+
+def get_framed_panel(size, fill_color, frame_color, width=3, fancy=True, display_size=None):
+    """Return a translucent panel with a decorative frame, FRAME_MARGIN larger on each side.
+    
+    Pass display_size for a panel whose size follows the display, so it is
+    dropped with the other display-sized surfaces on a mode change.
+    """
+    def build():
+        panel = pygame.Surface((size[0] + FRAME_MARGIN * 2, size[1] + FRAME_MARGIN * 2), pygame.SRCALPHA)
+        rect = pygame.Rect(FRAME_MARGIN, FRAME_MARGIN, size[0], size[1])
+        panel.fill(fill_color, rect)
+        draw_decorative_frame(panel, rect, frame_color, width=width, fancy=fancy)
+        return panel
+    key = ("framed", tuple(size), tuple(fill_color), tuple(frame_color), width, fancy, display_size)
+    return panel_cache.get(key, build)
+
+def get_shadowed_text(font, text, color, shadow_color, offsets, **anchor):
+    """Return text drawn over shadow copies at each offset, and where to blit it.
+    
+    anchor positions the main text like Surface.get_rect(), e.g. center=(x, y);
+    the returned position accounts for the shadows around it.
+    """
+    xs = [dx for dx, _ in offsets] + [0]
+    ys = [dy for _, dy in offsets] + [0]
+    spread = (max(xs) - min(xs), max(ys) - min(ys))
+    origin = (-min(xs), -min(ys))
+    
+    def build():
+        text_surf = font.render(text, True, color)
+        shadow_surf = font.render(text, True, shadow_color)
+        w, h = text_surf.get_size()
+        surf = pygame.Surface((w + spread[0], h + spread[1]), pygame.SRCALPHA)
+        for dx, dy in offsets:
+            surf.blit(shadow_surf, (origin[0] + dx, origin[1] + dy))
+        surf.blit(text_surf, origin)
+        return surf
+    
+    key = ("shadowed", id(font), text, tuple(color), tuple(shadow_color), tuple(offsets))
+    surf = sprite_cache.get(key, build)
+    main_rect = pygame.Rect(0, 0, surf.get_width() - spread[0], surf.get_height() - spread[1])
+    for attr, value in anchor.items():
+        setattr(main_rect, attr, value)
+    return surf, (main_rect.x - origin[0], main_rect.y - origin[1])
+
+def get_circle_sprite(radius, color):
+    """Return a circle sprite; blit it at (x - radius, y - radius) to center it on (x, y).
+    
+    The color's alpha is ignored, matching pygame.draw on the display surface.
+    """
+    def build():
+        sprite = pygame.Surface((radius * 2 + 1, radius * 2 + 1), pygame.SRCALPHA)
+        pygame.draw.circle(sprite, color[:3], (radius, radius), radius)
+        return sprite
+    return sprite_cache.get(("circle", radius, tuple(color[:3])), build)
+
+def particle_effect(renderer, pos, color, size, num_particles=8):
     """Draw elaborate particle effects for button interactions."""
     particles = []
     for i in range(num_particles):
-        angle = math.radians(random.randint(0, 360))
-        speed = random.uniform(2, 6)
-        size = random.randint(2, 5)
-        life = random.randint(20, 40)
+        angle = math.radians(rng.randint(0, 360))
+        speed = rng.uniform(2, 6)
+        size = rng.randint(2, 5)
+        life = rng.randint(20, 40)
         particles.append({
             'pos': [pos[0], pos[1]],
             'vel': [math.cos(angle) * speed, math.sin(angle) * speed],
@@ -37,9 +148,9 @@ def particle_effect(surface, pos, color, size, num_particles=8):
     # Draw particles at final positions
     for p in particles:
         if p['life'] > 0:
-            pygame.draw.circle(surface, p['color'], 
-                             (int(p['pos'][0]), int(p['pos'][1])), 
-                             p['size'])
+            r = p['size']
+            renderer.blit(get_circle_sprite(r, p['color']), 
+                          (int(p['pos'][0]) - r, int(p['pos'][1]) - r))
 
 def draw_decorative_frame(surface, rect, color, width=3, fancy=False):
     """Draw a decorative frame with corner embellishments."""
@@ -80,36 +191,64 @@ def draw_decorative_frame(surface, rect, color, width=3, fancy=False):
         pygame.draw.circle(surface, color, (rect.left, rect.centery), 4)
         pygame.draw.circle(surface, color, (rect.right, rect.centery), 4)
 
-def create_ambient_particles():
+def create_ambient_particle(size):
+    """Create one ambient particle at a random position on a display of size."""
+    y = rng.randint(0, size[1])
+    return {
+        'x': rng.randint(0, size[0]),
+        'y': y,
+        'prev_y': y,
+        'size': rng.uniform(1, 3),
+        'speed': rng.uniform(12, 60),  # Pixels per second
+        'color': (
+            rng.randint(200, 255),  # R
+            rng.randint(180, 255),  # G
+            rng.randint(0, 100),    # B
+            rng.randint(20, 60)     # Alpha
+        )
+    }
+
+def create_ambient_particles(size, count=30):
     """Create ambient floating particles for background atmosphere."""
-    particles = []
-    for _ in range(30):
-        particles.append({
-            'x': random.randint(0, WIDTH),
-            'y': random.randint(0, HEIGHT),
-            'size': random.uniform(1, 3),
-            'speed': random.uniform(0.2, 1),
-            'color': (
-                random.randint(200, 255),  # R
-                random.randint(180, 255),  # G
-                random.randint(0, 100),    # B
-                random.randint(20, 60)     # Alpha
-            )
-        })
-    return particles
+    return [create_ambient_particle(size) for _ in range(count)]
 
-def update_ambient_particles(particles):
-    """Update ambient particle positions and draw them."""
+def resize_ambient_particles(particles, count, size):
+    """Grow or shrink the particle list in place to count particles."""
+    while len(particles) < count:
+        particles.append(create_ambient_particle(size))
+    del particles[count:]
+
+def rescale_ambient_particles(particles, old_size, new_size):
+    """Move particles to the same relative positions on a resized display."""
+    sx, sy = new_size[0] / old_size[0], new_size[1] / old_size[1]
+    for p in particles:
+        p['x'] *= sx
+        p['y'] *= sy
+        p['prev_y'] *= sy
+
+def update_ambient_particles(particles, dt, size):
+    """Advance ambient particle positions by dt seconds on a display of size."""
     for p in particles:
-        p['y'] -= p['speed']
+        p['prev_y'] = p['y']
+        p['y'] -= p['speed'] * dt
         if p['y'] < 0:
-            p['y'] = HEIGHT
-            p['x'] = random.randint(0, WIDTH)
-        
-        # Draw the particle
-        pygame.draw.circle(
-            SCREEN, 
-            p['color'], 
-            (int(p['x']), int(p['y'])), 
-            int(p['size'])
-        )
\ No newline at end of file
+            p['y'] = size[1]
+            p['prev_y'] = size[1]  # Don't interpolate across the wrap
+            p['x'] = rng.randint(0, size[0])
+
+def draw_ambient_particles(renderer, particles, alpha=1.0):
+    """Draw ambient particles interpolated between their last two positions."""
+    for p in particles:
+        y = p['prev_y'] + (p['y'] - p['prev_y']) * alpha
+        r = int(p['size'])
+        renderer.blit(get_circle_sprite(r, p['color']), (int(p['x']) - r, int(y) - r))
+
+def draw_cursor(renderer):
+    """Draw the custom cursor; call this last, right before presenting."""
+    if not CURSOR_IMG:
+        return
+    # Late-latching samples the mouse after the rest of the frame is drawn,
+    # so the cursor doesn't trail the real pointer by a frame's work
+    pos = latch_mouse_pos() if LATE_LATCH_CURSOR else get_mouse_pos()
+    cursor_rect = CURSOR_IMG.get_rect(center=pos)
+    renderer.blit(CURSOR_IMG, cursor_rect.topleft)
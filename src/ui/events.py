@@ -0,0 +1,54 @@
+"""
+Event dispatching for UI screens.
+"""
+import pygame
+
+class EventDispatcher:
+    """Routes events by type to subscribed handlers.
+    
+    Event types nobody subscribed to are blocked at the SDL queue, and runs
+    of consecutive MOUSEMOTION events are merged into one per frame.
+    """
+    
+    def __init__(self):
+        self.handlers = {}
+    
+    def subscribe(self, event_type, handler):
+        """Call handler(event) for every event of the given type."""
+        self.handlers.setdefault(event_type, []).append(handler)
+    
+    def activate(self):
+        """Only let subscribed event types into the queue."""
+        pygame.event.set_blocked(None)
+        pygame.event.set_allowed([pygame.QUIT] + list(self.handlers))
+    
+    def dispatch(self, events):
+        """Send events to their handlers.
+        
+        Returns the first non-None handler result, which screens use to
+        signal a state change; remaining events are dropped in that case.
+        """
+        for event in coalesce_motion(events):
+            for handler in self.handlers.get(event.type, ()):
+                result = handler(event)
+                if result is not None:
+                    return result
+        return None
+
+def coalesce_motion(events):
+    """Merge each run of consecutive MOUSEMOTION events into the latest one.
+    
+    Relative movement is summed so nothing is lost; motion is never merged
+    across other events, so presses and releases keep their order.
+    """
+    merged = []
+    for event in events:
+        if event.type == pygame.MOUSEMOTION and merged and merged[-1].type == pygame.MOUSEMOTION:
+            previous = merged[-1]
+            attrs = dict(event.dict)
+            if "rel" in attrs and "rel" in previous.dict:
+                attrs["rel"] = (previous.rel[0] + event.rel[0], previous.rel[1] + event.rel[1])
+            merged[-1] = pygame.event.Event(pygame.MOUSEMOTION, attrs)
+        else:
+            merged.append(event)
+    return merged
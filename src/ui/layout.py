@@ -0,0 +1,51 @@
+"""
+Anchored, resolution-aware layout.
+
+Widgets are described once by size, anchor and position relative to the
+display or to another widget, and their rects are computed per display
+size and memoized, so a relayout after a mode change is a dictionary
+lookup once each size has been seen.
+"""
+import pygame
+
+def resolve(value, total):
+    """Pixels for value: ints are pixels, floats are fractions of total."""
+    if isinstance(value, float):
+        return int(round(value * total))
+    return value
+
+class Layout:
+    """Named widget rects positioned by anchors, computed once per display size."""
+
+    def __init__(self):
+        self.specs = {}  # name -> (size, anchor, at, offset, parent), in insertion order
+        self.cache = {}  # display size -> {name: Rect}
+
+    def add(self, name, size=(0, 0), anchor="center", at=(0.5, 0.5), offset=(0, 0), parent=None):
+        """Describe a widget.
+
+        size is (width, height), each in pixels (int) or as a fraction of the
+        parent (float); (0, 0) makes a point, for text placed by an anchor.
+        The widget's anchor (any pygame Rect point such as "midtop") sits at
+        at, a fractional position within the parent (the display, or a
+        widget added earlier), moved by offset pixels.
+        """
+        if parent is not None and parent not in self.specs:
+            raise ValueError(f"Layout parent {parent!r} must be added before {name!r}")
+        self.specs[name] = (size, anchor, at, offset, parent)
+        self.cache.clear()
+
+    def rects(self, display_size):
+        """Return {name: Rect} for display_size; treat the rects as read-only."""
+        rects = self.cache.get(display_size)
+        if rects is None:
+            rects = {}
+            screen = pygame.Rect((0, 0), display_size)
+            for name, (size, anchor, at, offset, parent) in self.specs.items():
+                area = rects[parent] if parent is not None else screen
+                rect = pygame.Rect(0, 0, resolve(size[0], area.width), resolve(size[1], area.height))
+                setattr(rect, anchor, (area.x + resolve(float(at[0]), area.width) + offset[0],
+                                       area.y + resolve(float(at[1]), area.height) + offset[1]))
+                rects[name] = rect
+            self.cache[display_size] = rects
+        return rects
@@ -2,6 +2,7 @@
 Main menu for the game.
 """
 import math
+import time
 import pygame
 import sys
 import os
@@ -9,206 +10,339 @@ import os
 # Add the root directory to the path so we can import config
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
 from config import (
-    WIDTH, HEIGHT, GOLD, DARK_GOLD, VERY_DARK_PURPLE, 
-    DARK_RED, LIGHT_RED, SCREEN, BACKGROUND_IMG,
-    CURSOR_IMG, TITLE_FONT, SUBTITLE_FONT
+    GOLD, DARK_GOLD, VERY_DARK_PURPLE, 
+    DARK_RED, LIGHT_RED, RENDERER,
+    TITLE_FONT, SUBTITLE_FONT, FONTS, SURFACE_MEMORY,
+    PACER, SIMULATION_RATE, MAX_CATCHUP_STEPS, BG_SCROLL_SPEED
 )
 from src.ui.button import Button
-from src.ui.effects import draw_decorative_frame, create_ambient_particles, update_ambient_particles
+from src.ui.events import EventDispatcher
+from src.ui.tween import tweens
+from src.ui.quality import quality
+from src.ui.layout import Layout
+from src.ui.effects import (
+    create_ambient_particles, update_ambient_particles, draw_ambient_particles, resize_ambient_particles,
+    rescale_ambient_particles,
+    get_panel, get_backdrop, get_framed_panel, get_shadowed_text, get_circle_sprite,
+    sprite_cache, FRAME_MARGIN, draw_cursor
+)
+from src.game.timestep import FixedTimestep
+from src.game.prewarm import prewarmer
+from src.game.latency import latency
+from src.game.input import poll_events, get_mouse_pos, next_frame_time
+
+# Half-width in pixels of the shimmer travelling along the divider
+SHIMMER_RADIUS = 49
+
+BUTTON_SIZE = (400, 75)
+
+# Widget placement relative to the display, so the menu holds together at any resolution
+LAYOUT = Layout()
+LAYOUT.add("title_frame", (800, 200), at=(0.5, 0.25))
+LAYOUT.add("start", BUTTON_SIZE, "midtop", at=(0.5, 0.5))
+# Stagger the buttons for visual interest
+LAYOUT.add("load", BUTTON_SIZE, "midtop", at=(0.5, 0.5), offset=(-20, 90))
+LAYOUT.add("settings", BUTTON_SIZE, "midtop", at=(0.5, 0.5), offset=(20, 180))
+LAYOUT.add("exit", BUTTON_SIZE, "midtop", at=(0.5, 0.5), offset=(0, 270))
+LAYOUT.add("divider", (1/3, 0), "midleft", at=(1/3, 1/3), offset=(0, 50))
+LAYOUT.add("version", anchor="bottomright", at=(1.0, 1.0), offset=(-20, -20))
+
+def get_divider_sprite(width, display_size):
+    """Return the plain gold divider line under the title.
+    
+    Its width follows the display, so it's keyed by the display size too and
+    dropped with the other display-sized surfaces on a mode change.
+    """
+    def build():
+        sprite = pygame.Surface((width + 2, 4), pygame.SRCALPHA)
+        for x in range(width):
+            pygame.draw.line(sprite, GOLD, (x, 1), (x+1, 1), 2)
+        return sprite
+    return sprite_cache.get(("divider", width, display_size), build)
+
+def get_shimmer_strip():
+    """Return the brightened section of divider that slides along it."""
+    def build():
+        sprite = pygame.Surface((SHIMMER_RADIUS * 2 + 2, 4), pygame.SRCALPHA)
+        for dist in range(-SHIMMER_RADIUS, SHIMMER_RADIUS + 1):
+            # Brighten color based on proximity to shimmer position
+            bright_factor = 1.0 - (abs(dist) / 50)
+            color = (
+                min(255, int(GOLD[0] * (1 + bright_factor * 0.5))),
+                min(255, int(GOLD[1] * (1 + bright_factor * 0.5))),
+                min(255, int(GOLD[2] * (1 + bright_factor)))
+            )
+            x = dist + SHIMMER_RADIUS
+            pygame.draw.line(sprite, color, (x, 1), (x+1, 1), 2)
+        return sprite
+    return sprite_cache.get(("shimmer",), build)
+
+def get_ornament_sprite(pulse_size):
+    """Return a divider ornament at the given pulse size, centered in the sprite."""
+    def build():
+        half = pulse_size + 8
+        sprite = pygame.Surface((half * 2 + 1, half * 2 + 1), pygame.SRCALPHA)
+        pygame.draw.circle(sprite, GOLD, (half, half), pulse_size)
+        # Add small rune marks around the circle
+        for i in range(4):
+            angle = math.radians(i * 90)
+            px = half + math.cos(angle) * (pulse_size + 5)
+            py = half + math.sin(angle) * (pulse_size + 5)
+            pygame.draw.circle(sprite, GOLD, (round(px), round(py)), 2)
+        return sprite
+    return sprite_cache.get(("ornament", pulse_size), build)
 
 class MainMenu:
     """Main menu screen."""
     
     def __init__(self):
-        # Create a semi-transparent overlay for better text readability
-        self.overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-        self.overlay.fill((0, 0, 0, 160))  # Black with 60% opacity
-        
-        # Create decorative title frame
-        self.title_frame = pygame.Rect(WIDTH//2 - 400, HEIGHT//4 - 100, 800, 200)
-        
-        # Create buttons
-        button_width, button_height = 400, 75
-        button_x = WIDTH//2 - button_width//2
-        
-        # Stagger the buttons for visual interest
+        # Create buttons; the layout places them
         self.buttons = {
-            'start': Button("New Adventure", (button_x, HEIGHT//2), 
-                          (button_width, button_height), DARK_RED, LIGHT_RED),
-            
-            'load': Button("Load Adventure", (button_x - 20, HEIGHT//2 + 90), 
-                         (button_width, button_height), DARK_RED, LIGHT_RED),
-            
-            'settings': Button("Settings", (button_x + 20, HEIGHT//2 + 180), 
-                             (button_width, button_height), DARK_RED, LIGHT_RED),
-            
-            'exit': Button("Exit", (button_x, HEIGHT//2 + 270), 
-                         (button_width, button_height), DARK_RED, LIGHT_RED)
+            'start': Button("New Adventure", (0, 0), BUTTON_SIZE, DARK_RED, LIGHT_RED),
+            'load': Button("Load Adventure", (0, 0), BUTTON_SIZE, DARK_RED, LIGHT_RED),
+            'settings': Button("Settings", (0, 0), BUTTON_SIZE, DARK_RED, LIGHT_RED),
+            'exit': Button("Exit", (0, 0), BUTTON_SIZE, DARK_RED, LIGHT_RED)
         }
         
+        # Lay out the title frame, buttons and divider for the current display
+        self.size = RENDERER.size
+        self.place_widgets(LAYOUT.rects(self.size))
+        
         # For background animation
         self.bg_offset = 0
+        self.prev_bg_offset = 0
         
         # Create ambient particles
-        self.ambient_particles = create_ambient_particles()
+        self.ambient_particles = create_ambient_particles(self.size, quality.preset["particles"])
         
-        # Create a clock to control frame rate
-        self.clock = pygame.time.Clock()
+        # Simulation runs at a fixed rate independent of the frame rate
+        self.timestep = FixedTimestep(SIMULATION_RATE, MAX_CATCHUP_STEPS)
         
+        # Route only the events this screen cares about
+        self.events = EventDispatcher()
+        self.events.subscribe(pygame.QUIT, self.on_quit)
+        self.events.subscribe(pygame.KEYDOWN, self.on_key)
+        self.events.subscribe(pygame.MOUSEBUTTONDOWN, self.on_click)
+        
+    def place_widgets(self, rects):
+        """Position everything from a computed layout."""
+        self.title_frame = rects["title_frame"]
+        self.divider = rects["divider"]
+        self.version_pos = rects["version"].topleft
+        for name, button in self.buttons.items():
+            button.place(rects[name])
+    
+    def apply_layout(self, size):
+        """Re-lay out the menu if the display size has changed."""
+        if size == self.size:
+            return
+        # Keep the scrolling background and particles at the same relative positions
+        scale = size[0] / self.size[0]
+        self.bg_offset *= scale
+        self.prev_bg_offset *= scale
+        rescale_ambient_particles(self.ambient_particles, self.size, size)
+        self.size = size
+        self.place_widgets(LAYOUT.rects(size))
+    
     def handle_events(self):
         """Handle user input events."""
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
-            
-            if self.buttons['start'].handle_event(event):
-                print("New Adventure clicked")
-                # Here we would transition to character creation or game start
-                return "new_game"
-            
-            if self.buttons['load'].handle_event(event):
-                print("Load Adventure clicked")
-                # Here we would load saved games
-                return "load_game"
-            
-            if self.buttons['settings'].handle_event(event):
-                print("Settings clicked")
-                # Here we would show settings menu
-                return "settings"
-            
-            if self.buttons['exit'].handle_event(event):
-                pygame.quit()
-                sys.exit()
+        self.apply_layout(RENDERER.size)
+        return self.events.dispatch(poll_events())
+    
+    def on_quit(self, event):
+        """Close the game."""
+        pygame.quit()
+        sys.exit()
+    
+    def on_key(self, event):
+        """Handle keyboard shortcuts."""
+        # F3 toggles the surface memory readout
+        if event.key == pygame.K_F3:
+            SURFACE_MEMORY.show_readout = not SURFACE_MEMORY.show_readout
+    
+    def on_click(self, event):
+        """Handle mouse clicks on the menu buttons."""
+        if self.buttons['start'].handle_event(event):
+            print("New Adventure clicked")
+            # Here we would transition to character creation or game start
+            return "new_game"
+        
+        if self.buttons['load'].handle_event(event):
+            print("Load Adventure clicked")
+            # Here we would load saved games
+            return "load_game"
+        
+        if self.buttons['settings'].handle_event(event):
+            print("Settings clicked")
+            # Here we would show settings menu
+            return "settings"
+        
+        if self.buttons['exit'].handle_event(event):
+            self.on_quit(event)
                 
         return None  # No state change
     
-    def update(self):
-        """Update menu state."""
-        time_passed = self.clock.tick(60)
-        mouse_pos = pygame.mouse.get_pos()
+    def update(self, dt):
+        """Advance menu state by one fixed step of dt seconds."""
+        time_passed = dt * 1000
+        mouse_pos = get_mouse_pos()
         
         # Update button states
         for button in self.buttons.values():
             button.update(mouse_pos, time_passed)
+        
+        # Advance running animations
+        tweens.update(dt)
             
         # Update background offset for animation
-        self.bg_offset = (self.bg_offset + 0.1) % WIDTH
+        self.prev_bg_offset = self.bg_offset
+        self.bg_offset = (self.bg_offset + BG_SCROLL_SPEED * dt) % self.size[0]
+        
+        # Move ambient particles, keeping as many as the quality tier allows
+        resize_ambient_particles(self.ambient_particles, quality.preset["particles"], self.size)
+        update_ambient_particles(self.ambient_particles, dt, self.size)
         
         return time_passed
     
-    def draw(self):
-        """Draw the menu screen."""
-        # Draw background
-        if BACKGROUND_IMG:
-            # Create a subtle moving background effect
-            SCREEN.blit(BACKGROUND_IMG, (-self.bg_offset, 0))
-            SCREEN.blit(BACKGROUND_IMG, (WIDTH - self.bg_offset, 0))
-        else:
-            # If no background image, use a gradient
-            for y in range(HEIGHT):
-                # Create a dark gradient
-                color_value = max(0, min(50, 50 - (y / HEIGHT) * 50))
-                pygame.draw.line(SCREEN, (color_value, color_value, color_value * 0.8), 
-                               (0, y), (WIDTH, y))
-        
-        # Apply the semi-transparent overlay
-        SCREEN.blit(self.overlay, (0, 0))
-        
-        # Update and draw ambient particles
-        update_ambient_particles(self.ambient_particles)
-        
-        # Draw decorative elements
+    def interpolated_bg_offset(self, alpha):
+        """Background offset between the last two simulation steps."""
+        prev = self.prev_bg_offset
+        if self.bg_offset < prev:
+            # The offset wrapped around during the last step
+            prev -= self.size[0]
+        return (prev + (self.bg_offset - prev) * alpha) % self.size[0]
+    
+    def title_sprites(self):
+        """Return the framed title panel, title and subtitle, with where to blit them."""
         # Use darker purple for the title frame
-        dark_frame_surface = pygame.Surface((self.title_frame.width, self.title_frame.height), pygame.SRCALPHA)
-        dark_frame_surface.fill((VERY_DARK_PURPLE[0], VERY_DARK_PURPLE[1], VERY_DARK_PURPLE[2], 180))
-        SCREEN.blit(dark_frame_surface, (self.title_frame.x, self.title_frame.y))
-        draw_decorative_frame(SCREEN, self.title_frame, GOLD, width=3, fancy=True)
+        frame_panel = get_framed_panel(self.title_frame.size, (*VERY_DARK_PURPLE, 180), GOLD)
         
-        # Draw main title with better glow effect
-        # Multiple layers of shadow at varying offsets for a more refined glow
+        # Multiple layers of shadow at varying offsets for a more refined glow,
+        # and fewer layers for the subtitle
         shadow_offsets = [(3, 3), (2, 2), (-2, -2), (2, -2), (-2, 2), (3, 2), (2, 3)]
-        for offset in shadow_offsets:
-            shadow_text = TITLE_FONT.render("Realms of Fate", True, DARK_GOLD)
-            shadow_rect = shadow_text.get_rect(center=(WIDTH//2 + offset[0], HEIGHT//4 - 30 + offset[1]))
-            SCREEN.blit(shadow_text, shadow_rect)
-            
-        title_text = TITLE_FONT.render("Realms of Fate", True, GOLD)
-        title_rect = title_text.get_rect(center=(WIDTH//2, HEIGHT//4 - 30))
-        SCREEN.blit(title_text, title_rect)
+        return [
+            (frame_panel, (self.title_frame.x - FRAME_MARGIN, self.title_frame.y - FRAME_MARGIN)),
+            get_shadowed_text(TITLE_FONT, "Realms of Fate", GOLD, DARK_GOLD, 
+                              shadow_offsets[:quality.preset["title_shadows"]],
+                              center=(self.title_frame.centerx, self.title_frame.centery - 30)),
+            get_shadowed_text(SUBTITLE_FONT, "Chronicles Unbound", GOLD, DARK_GOLD, 
+                              shadow_offsets[:min(4, quality.preset["title_shadows"])],
+                              center=(self.title_frame.centerx, self.title_frame.centery + 30)),
+        ]
+    
+    def version_sprite(self):
+        """Return the version label and where to blit it."""
+        return get_shadowed_text(FONTS.get("serif", 20), "Version 0.1 Alpha", GOLD, DARK_GOLD, 
+                                 [(1, 1)], bottomright=self.version_pos)
+    
+    def prewarm(self):
+        """Build everything the first frame needs, yielding each surface as it's made."""
+        self.apply_layout(RENDERER.size)
+        yield get_backdrop(self.size)
+        yield get_panel(self.size, (0, 0, 0, 160))
+        for sprite, _ in self.title_sprites():
+            yield sprite
+        yield get_divider_sprite(self.divider.width, self.size)
+        yield get_shimmer_strip()
+        # Every size the ornament pulses through
+        for pulse_size in range(2, 7):
+            yield get_ornament_sprite(pulse_size)
+        yield self.version_sprite()[0]
+        for button in self.buttons.values():
+            yield from button.prewarm()
+        for particle in self.ambient_particles:
+            yield get_circle_sprite(int(particle['size']), particle['color'])
+    
+    def draw(self, alpha=1.0):
+        """Draw the menu screen."""
+        self.apply_layout(RENDERER.size)
+        RENDERER.begin_frame()
+        SURFACE_MEMORY.begin_frame()
+        
+        # Draw background with a subtle moving effect, then the semi-transparent
+        # overlay (black with 60% opacity); these full-screen layers are
+        # composited together so they can be split across threads
+        backdrop = get_backdrop(self.size)
+        bg_offset = self.interpolated_bg_offset(alpha)
+        RENDERER.compose([
+            (backdrop, (-bg_offset, 0)),
+            (backdrop, (self.size[0] - bg_offset, 0)),
+            (get_panel(self.size, (0, 0, 0, 160)), (0, 0)),
+        ])
         
-        # Draw subtitle with similar treatment
-        for offset in shadow_offsets[:4]:  # Fewer shadow layers for subtitle
-            subtitle_shadow = SUBTITLE_FONT.render("Chronicles Unbound", True, DARK_GOLD)
-            subtitle_shadow_rect = subtitle_shadow.get_rect(center=(WIDTH//2 + offset[0], HEIGHT//4 + 30 + offset[1]))
-            SCREEN.blit(subtitle_shadow, subtitle_shadow_rect)
+        # Draw ambient particles
+        draw_ambient_particles(RENDERER, self.ambient_particles, alpha)
         
-        subtitle_text = SUBTITLE_FONT.render("Chronicles Unbound", True, GOLD)
-        subtitle_rect = subtitle_text.get_rect(center=(WIDTH//2, HEIGHT//4 + 30))
-        SCREEN.blit(subtitle_text, subtitle_rect)
+        # Draw decorative title frame, title and subtitle
+        for sprite in self.title_sprites():
+            RENDERER.blit(*sprite)
         
         # Draw decorative divider with animated shimmer effect
-        current_time = pygame.time.get_ticks()
-        shimmer_pos = (math.sin(current_time * 0.001) * 0.5 + 0.5) * (WIDTH*2//3 - WIDTH//3)
-        for x in range(WIDTH//3, WIDTH*2//3):
-            # Calculate distance from shimmer position
-            dist = abs(x - (WIDTH//3 + shimmer_pos))
-            if dist < 50:
-                # Brighten color based on proximity to shimmer position
-                bright_factor = 1.0 - (dist / 50)
-                color = (
-                    min(255, int(GOLD[0] * (1 + bright_factor * 0.5))),
-                    min(255, int(GOLD[1] * (1 + bright_factor * 0.5))),
-                    min(255, int(GOLD[2] * (1 + bright_factor)))
-                )
-            else:
-                color = GOLD
-            
-            pygame.draw.line(SCREEN, color, (x, HEIGHT//3 + 50), (x+1, HEIGHT//3 + 50), 2)
+        divider = self.divider
+        divider_y = divider.y
+        RENDERER.blit(get_divider_sprite(divider.width, self.size), (divider.left, divider_y - 1))
+        if quality.preset["shimmer"]:
+            shimmer_pos = (tweens.wave(1.0) * 0.5 + 0.5) * divider.width
+            center = int(round(divider.left + shimmer_pos))
+            left = max(center - SHIMMER_RADIUS, divider.left)
+            right = min(center + SHIMMER_RADIUS, divider.right - 1)
+            strip = get_shimmer_strip()
+            area = pygame.Rect(left - (center - SHIMMER_RADIUS), 0, right - left + 1, strip.get_height())
+            RENDERER.blit(strip, (left, divider_y - 1), area=area)
         
         # Draw ornamental details with animated pulsing
-        pulse = (math.sin(current_time * 0.002) * 0.3) + 0.7
+        pulse = (tweens.wave(2.0) * 0.3) + 0.7
         pulse_size = int(6 * pulse)
-        for x in [WIDTH//3, WIDTH*2//3]:
-            pygame.draw.circle(SCREEN, GOLD, (x, HEIGHT//3 + 50), pulse_size)
-            # Add small rune marks around the circle
-            for i in range(4):
-                angle = math.radians(i * 90)
-                px = x + math.cos(angle) * (pulse_size + 5)
-                py = HEIGHT//3 + 50 + math.sin(angle) * (pulse_size + 5)
-                pygame.draw.circle(SCREEN, GOLD, (int(px), int(py)), 2)
+        ornament = get_ornament_sprite(pulse_size)
+        half = ornament.get_width() // 2
+        for x in [divider.left, divider.right]:
+            RENDERER.blit(ornament, (x - half, divider_y - half))
         
         # Draw buttons
         for button in self.buttons.values():
-            button.draw(SCREEN)
+            button.draw(RENDERER)
         
         # Add version info with better styling
-        version_font = pygame.font.SysFont("serif", 20)
-        version_text = version_font.render("Version 0.1 Alpha", True, GOLD)
-        version_shadow = version_font.render("Version 0.1 Alpha", True, DARK_GOLD)
-        version_rect = version_text.get_rect(bottomright=(WIDTH - 20, HEIGHT - 20))
-        shadow_rect = version_shadow.get_rect(bottomright=(WIDTH - 19, HEIGHT - 19))
-        SCREEN.blit(version_shadow, shadow_rect)
-        SCREEN.blit(version_text, version_rect)
+        RENDERER.blit(*self.version_sprite())
+        
+        if SURFACE_MEMORY.show_readout:
+            SURFACE_MEMORY.draw_readout(RENDERER, FONTS.get("monospace", 18), (20, 20), GOLD)
         
         # Draw a custom cursor instead of the default one
-        if CURSOR_IMG:
-            cursor_rect = CURSOR_IMG.get_rect(center=pygame.mouse.get_pos())
-            SCREEN.blit(CURSOR_IMG, cursor_rect)
+        draw_cursor(RENDERER)
         
         # Update the display
-        pygame.display.flip()
+        RENDERER.present()
+        PACER.presented()
+        latency.frame_presented()
     
     def run(self):
         """Run the main menu loop."""
+        # Don't count time spent in other screens as simulation time
+        PACER.reset()
+        self.timestep.reset()
+        self.events.activate()
+        
         while True:
+            # Wait for the frame first, so the events we handle are as fresh as possible
+            frame_time = next_frame_time(PACER)
+            work_start = time.perf_counter()
+            prewarmer.frame_started()
+            
             # Handle events
             state_change = self.handle_events()
             if state_change:
                 return state_change
             
-            # Update
-            self.update()
+            # Update at a fixed rate, catching up on any time that has passed
+            for _ in range(self.timestep.advance(frame_time)):
+                self.update(self.timestep.step)
+            
+            # Draw, interpolating between the last two simulation states
+            self.draw(self.timestep.alpha)
+            
+            # Feed the frame's work time (excluding the wait) to auto quality
+            quality.observe((time.perf_counter() - work_start) * 1000)
             
-            # Draw
-            self.draw()
\ No newline at end of file
+            # Use idle time to warm up the scenes we might switch to
+            prewarmer.frame_done(idle=tweens.idle)
\ No newline at end of file
@@ -0,0 +1,120 @@
+"""
+Graphics quality tiers.
+
+Each tier scales the cost of the menus' visual effects together. In auto
+mode the tier follows measured frame times, stepping down quickly when
+frames run long and back up only after a sustained run of cheap frames.
+Replays follow the tier changes their recording made instead, so they draw
+the same workload whatever machine they run on.
+"""
+import sys
+import os
+
+# Add the root directory to the path so we can import config
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+from config import FPS, QUALITY_MODE
+
+TIERS = ("low", "medium", "high", "ultra")
+MODES = ("auto",) + TIERS
+
+# Effect knobs per tier; "high" is the original look
+PRESETS = {
+    "low": {"title_shadows": 1, "text_shadows": 1, "glow_rings": 0, "particles": 10, "shimmer": False},
+    "medium": {"title_shadows": 3, "text_shadows": 2, "glow_rings": 5, "particles": 20, "shimmer": True},
+    "high": {"title_shadows": 7, "text_shadows": 4, "glow_rings": 10, "particles": 30, "shimmer": True},
+    "ultra": {"title_shadows": 7, "text_shadows": 4, "glow_rings": 10, "particles": 60, "shimmer": True},
+}
+
+class QualityManager:
+    """Holds the active quality tier and adjusts it in auto mode."""
+    
+    def __init__(self, mode="auto", target_ms=1000 / 60, window=90,
+                 downgrade_at=0.9, upgrade_at=0.5, upgrade_windows=3):
+        self.target_ms = target_ms
+        self.window = window  # Frames averaged per decision
+        self.downgrade_at = downgrade_at  # Step down above this fraction of the frame budget
+        self.upgrade_at = upgrade_at  # Step up below this fraction...
+        self.upgrade_windows = upgrade_windows  # ...for this many windows in a row
+        self.samples = []
+        self.calm_windows = 0
+        self.version = 0  # Bumped on every tier change so widgets can rebuild
+        self.tier_callbacks = []
+        self.recorded = None  # While replaying, returns the tiers the current frame switched to
+        self.mode = None
+        self.tier = "high"
+        self.set_mode(mode)
+    
+    @property
+    def preset(self):
+        """The effect knobs for the active tier."""
+        return PRESETS[self.tier]
+    
+    def set_mode(self, mode):
+        """Choose a fixed tier, or "auto"."""
+        if mode not in MODES:
+            raise ValueError(f"Unknown quality mode {mode!r}, expected one of {', '.join(MODES)}")
+        self.mode = mode
+        self.samples.clear()
+        self.calm_windows = 0
+        if mode == "auto":
+            print(f"Quality mode: auto (currently {self.tier})")
+        elif mode == self.tier:
+            print(f"Quality mode: {mode}")
+        else:
+            self.set_tier(mode, "selected")
+    
+    def add_tier_callback(self, callback):
+        """Call callback(tier) whenever the tier changes."""
+        self.tier_callbacks.append(callback)
+    
+    def set_tier(self, tier, reason):
+        """Switch to tier and log why."""
+        if tier == self.tier:
+            return
+        print(f"Quality tier changed: {self.tier} -> {tier} ({reason})")
+        self.tier = tier
+        self.version += 1
+        for callback in self.tier_callbacks:
+            callback(tier)
+    
+    def follow(self, mode, tier, recorded):
+        """Replay a recording's tiers instead of measuring frames.
+        
+        Starts in mode at tier; after each frame, recorded() returns the
+        tiers that frame switched to when it was recorded.
+        """
+        self.set_mode(mode)
+        self.set_tier(tier, "recorded")
+        self.recorded = recorded
+    
+    def observe(self, frame_ms):
+        """Record the work time of one frame; in auto mode, maybe change tier."""
+        if self.recorded is not None:
+            for tier in self.recorded():
+                self.set_tier(tier, "recorded")
+            return
+        if self.mode != "auto":
+            return
+        self.samples.append(frame_ms)
+        if len(self.samples) < self.window:
+            return
+        
+        average = sum(self.samples) / len(self.samples)
+        self.samples.clear()
+        index = TIERS.index(self.tier)
+        
+        if average > self.target_ms * self.downgrade_at:
+            self.calm_windows = 0
+            if index > 0:
+                self.set_tier(TIERS[index - 1], f"auto, average frame {average:.1f} ms")
+        elif average < self.target_ms * self.upgrade_at:
+            # Only step up after several cheap windows, so we don't oscillate
+            self.calm_windows += 1
+            if self.calm_windows >= self.upgrade_windows and index < len(TIERS) - 1:
+                self.calm_windows = 0
+                self.set_tier(TIERS[index + 1], f"auto, average frame {average:.1f} ms")
+        else:
+            self.calm_windows = 0
+
+# Shared quality settings for all screens
+quality = QualityManager(QUALITY_MODE, 1000 / (FPS or 60))
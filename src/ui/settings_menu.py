@@ -2,6 +2,7 @@
 Settings menu for the game.
 """
 import math
+import time
 import pygame
 import sys
 import os
@@ -9,68 +10,98 @@ import os
 # Add the root directory to the path so we can import config
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
 from config import (
-    WIDTH, HEIGHT, GOLD, DARK_GOLD, VERY_DARK_PURPLE, 
-    DARK_RED, LIGHT_RED, SCREEN, BACKGROUND_IMG,
-    CURSOR_IMG, TITLE_FONT, SUBTITLE_FONT, MENU_FONT
+    GOLD, DARK_GOLD, VERY_DARK_PURPLE, 
+    DARK_RED, LIGHT_RED, RENDERER, MUSIC, MUSIC_VOLUME,
+    TITLE_FONT, SUBTITLE_FONT, MENU_FONT, FONTS, SURFACE_MEMORY,
+    PACER, SIMULATION_RATE, MAX_CATCHUP_STEPS, BG_SCROLL_SPEED
 )
 from src.ui.button import Button
-from src.ui.effects import draw_decorative_frame, create_ambient_particles, update_ambient_particles
+from src.ui.events import EventDispatcher
+from src.ui.tween import tweens
+from src.ui.quality import quality, MODES
+from src.ui.layout import Layout
+from src.ui.effects import (
+    create_ambient_particles, update_ambient_particles, draw_ambient_particles, resize_ambient_particles,
+    rescale_ambient_particles,
+    get_panel, get_backdrop, get_framed_panel, get_shadowed_text, get_circle_sprite,
+    FRAME_MARGIN, draw_cursor
+)
+from src.game.timestep import FixedTimestep
+from src.game.prewarm import prewarmer
+from src.game.latency import latency
+from src.game.input import poll_events, get_mouse_pos, next_frame_time
+
+# Rows of the settings panel, top to bottom
+ROWS = ('music', 'sfx', 'fullscreen', 'difficulty', 'quality')
+
+def build_layout():
+    """Describe where every widget goes, relative to the display or the settings panel."""
+    layout = Layout()
+    layout.add("title_frame", (800, 100), at=(0.5, 1/6))
+    # The panel's height follows the display's (600 px at 1080), so it fits down to 720
+    layout.add("settings_frame", (900, 600 / 1080), "midtop", at=(0.5, 0.25))
+    layout.add("back", (400, 75), "midtop", at=(0.5, 1.0), offset=(0, 60), parent="settings_frame")
+    
+    # Each row has its label on the left of the panel and its control on the right;
+    # rows are spread over the panel's height, 100 px apart in a 600 px panel
+    for row, key in enumerate(ROWS):
+        center = (80 + row * 100 + 37) / 600
+        layout.add(f"{key}_label", anchor="midleft", at=(0, center), offset=(100, 0), parent="settings_frame")
+        
+        def control(name, size, x):
+            layout.add(name, size, "midleft", at=(0, center), offset=(x, 0), parent="settings_frame")
+        
+        if key in ('music', 'sfx'):
+            control(key, (300, 20), 500)
+        elif key == 'fullscreen':
+            control(key, (30, 30), 500)
+        elif key == 'difficulty':
+            for i in range(3):
+                control(f"difficulty_{i}", (80, 30), 500 + i * 100)
+        elif key == 'quality':
+            for i in range(len(MODES)):
+                control(f"quality_{i}", (70, 30), 500 + i * 75)
+    return layout
+
+LAYOUT = build_layout()
 
 class SettingsMenu:
     """Settings menu screen."""
     
     def __init__(self):
-        # Create a semi-transparent overlay for better text readability
-        self.overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-        self.overlay.fill((0, 0, 0, 160))  # Black with 60% opacity
-        
-        # Create decorative title frame
-        self.title_frame = pygame.Rect(WIDTH//2 - 400, HEIGHT//6 - 50, 800, 100)
-        
-        # Create settings panel frame
-        self.settings_frame = pygame.Rect(WIDTH//2 - 450, HEIGHT//4, 900, 500)
-        
-        # Create buttons
-        button_width, button_height = 400, 75
-        button_x = WIDTH//2 - button_width//2
-        
-        # Back button
+        # Back button; the layout places it
         self.buttons = {
-            'back': Button("Back to Main Menu", (button_x, HEIGHT - 150), 
-                          (button_width, button_height), DARK_RED, LIGHT_RED)
+            'back': Button("Back to Main Menu", (0, 0), (400, 75), DARK_RED, LIGHT_RED)
         }
         
-        # Settings labels (position and text)
+        # Settings labels (text; the layout fills in positions)
         self.settings_labels = {
-            'music': {"text": "Music Volume", "pos": (WIDTH//2 - 350, HEIGHT//4 + 80 + button_height//2)},
-            'sfx': {"text": "Sound Effects", "pos": (WIDTH//2 - 350, HEIGHT//4 + 180 + button_height//2)},
-            'fullscreen': {"text": "Fullscreen", "pos": (WIDTH//2 - 350, HEIGHT//4 + 280 + button_height//2)},
-            'difficulty': {"text": "Difficulty", "pos": (WIDTH//2 - 350, HEIGHT//4 + 380 + button_height//2)}
+            'music': {"text": "Music Volume"},
+            'sfx': {"text": "Sound Effects"},
+            'fullscreen': {"text": "Fullscreen"},
+            'difficulty': {"text": "Difficulty"},
+            'quality': {"text": "Graphics"}
         }
         
         # Settings values and states
         self.settings = {
-            'music_volume': 0.4,  # 0.0 to 1.0
+            'music_volume': MUSIC_VOLUME,  # 0.0 to 1.0
             'sfx_volume': 1.0,    # 0.0 to 1.0
             'fullscreen': False,
-            'difficulty': 1       # 0: Easy, 1: Normal, 2: Hard
+            'difficulty': 1,      # 0: Easy, 1: Normal, 2: Hard
+            'quality': quality.mode  # auto, low, medium, high or ultra
         }
         
-        # Slider regions
-        self.slider_regions = {
-            'music': pygame.Rect(WIDTH//2 + 50, HEIGHT//4 + 80 + button_height//2 - 10, 300, 20),
-            'sfx': pygame.Rect(WIDTH//2 + 50, HEIGHT//4 + 180 + button_height//2 - 10, 300, 20)
-        }
+        # Slider and toggle/selection regions, filled in by the layout
+        self.slider_regions = {}
+        self.toggle_regions = {}
         
-        # Toggle/selection regions
-        self.toggle_regions = {
-            'fullscreen': pygame.Rect(WIDTH//2 + 50, HEIGHT//4 + 280 + button_height//2 - 15, 30, 30),
-            'difficulty': [
-                pygame.Rect(WIDTH//2 + 50, HEIGHT//4 + 380 + button_height//2 - 15, 80, 30),  # Easy
-                pygame.Rect(WIDTH//2 + 150, HEIGHT//4 + 380 + button_height//2 - 15, 80, 30), # Normal
-                pygame.Rect(WIDTH//2 + 250, HEIGHT//4 + 380 + button_height//2 - 15, 80, 30)  # Hard
-            ]
-        }
+        # Lay everything out for the current display
+        self.size = RENDERER.size
+        self.place_widgets(LAYOUT.rects(self.size))
+        
+        # Pre-rendered widgets, keyed by name: (state, surface)
+        self.widget_sprites = {}
         
         # Active slider (if user is dragging)
         self.active_slider = None
@@ -80,57 +111,110 @@ class SettingsMenu:
         
         # For background animation
         self.bg_offset = 0
+        self.prev_bg_offset = 0
         
         # Create ambient particles
-        self.ambient_particles = create_ambient_particles()
-        
-        # Create a clock to control frame rate
-        self.clock = pygame.time.Clock()
-        
+        self.ambient_particles = create_ambient_particles(self.size, quality.preset["particles"])
+        
+        # Simulation runs at a fixed rate independent of the frame rate
+        self.timestep = FixedTimestep(SIMULATION_RATE, MAX_CATCHUP_STEPS)
+        
+        # Route only the events this screen cares about
+        self.events = EventDispatcher()
+        self.events.subscribe(pygame.QUIT, self.on_quit)
+        self.events.subscribe(pygame.KEYDOWN, self.on_key)
+        self.events.subscribe(pygame.MOUSEBUTTONDOWN, self.on_mouse_down)
+        self.events.subscribe(pygame.MOUSEBUTTONUP, self.on_mouse_up)
+        self.events.subscribe(pygame.MOUSEMOTION, self.on_mouse_motion)
+        
+    def place_widgets(self, rects):
+        """Position everything from a computed layout."""
+        self.title_frame = rects["title_frame"]
+        self.settings_frame = rects["settings_frame"]
+        self.buttons['back'].place(rects["back"])
+        for key, label_info in self.settings_labels.items():
+            label_info["pos"] = rects[f"{key}_label"].topleft
+        self.slider_regions['music'] = rects["music"]
+        self.slider_regions['sfx'] = rects["sfx"]
+        self.toggle_regions['fullscreen'] = rects["fullscreen"]
+        # Easy, Normal, Hard
+        self.toggle_regions['difficulty'] = [rects[f"difficulty_{i}"] for i in range(3)]
+        # One option per quality mode: Auto, Low, Med, High, Ultra
+        self.toggle_regions['quality'] = [rects[f"quality_{i}"] for i in range(len(MODES))]
+    
+    def apply_layout(self, size):
+        """Re-lay out the menu if the display size has changed."""
+        if size == self.size:
+            return
+        # Keep the scrolling background and particles at the same relative positions
+        scale = size[0] / self.size[0]
+        self.bg_offset *= scale
+        self.prev_bg_offset *= scale
+        rescale_ambient_particles(self.ambient_particles, self.size, size)
+        self.size = size
+        self.place_widgets(LAYOUT.rects(size))
+    
     def handle_events(self):
         """Handle user input events."""
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
-            
-            # Check main button events
-            if self.buttons['back'].handle_event(event):
-                self.save_settings()
-                return "main_menu"
-                
-            # Handle mouse events for sliders and toggles
-            if event.type == pygame.MOUSEBUTTONDOWN:
-                mouse_pos = pygame.mouse.get_pos()
-                
-                # Check sliders
-                for setting, rect in self.slider_regions.items():
-                    if rect.collidepoint(mouse_pos):
-                        self.active_slider = setting
-                        self.is_dragging = True
-                        # Update value based on click position
-                        self.update_slider_value(setting, mouse_pos[0])
-                
-                # Check toggles
-                if self.toggle_regions['fullscreen'].collidepoint(mouse_pos):
-                    self.settings['fullscreen'] = not self.settings['fullscreen']
-                    self.toggle_fullscreen()
-                
-                # Check difficulty options
-                for i, rect in enumerate(self.toggle_regions['difficulty']):
-                    if rect.collidepoint(mouse_pos):
-                        self.settings['difficulty'] = i
-            
-            # Handle slider dragging
-            elif event.type == pygame.MOUSEBUTTONUP:
-                self.is_dragging = False
-                self.active_slider = None
-            
-            elif event.type == pygame.MOUSEMOTION and self.is_dragging and self.active_slider:
-                self.update_slider_value(self.active_slider, event.pos[0])
-                
+        self.apply_layout(RENDERER.size)
+        return self.events.dispatch(poll_events())
+    
+    def on_quit(self, event):
+        """Close the game."""
+        pygame.quit()
+        sys.exit()
+    
+    def on_key(self, event):
+        """Handle keyboard shortcuts."""
+        # F3 toggles the surface memory readout
+        if event.key == pygame.K_F3:
+            SURFACE_MEMORY.show_readout = not SURFACE_MEMORY.show_readout
+    
+    def on_mouse_down(self, event):
+        """Handle clicks on the back button, sliders and toggles."""
+        # Check main button events
+        if self.buttons['back'].handle_event(event):
+            self.save_settings()
+            return "main_menu"
+        
+        mouse_pos = get_mouse_pos()
+        
+        # Check sliders
+        for setting, rect in self.slider_regions.items():
+            if rect.collidepoint(mouse_pos):
+                self.active_slider = setting
+                self.is_dragging = True
+                # Update value based on click position
+                self.update_slider_value(setting, mouse_pos[0])
+        
+        # Check toggles
+        if self.toggle_regions['fullscreen'].collidepoint(mouse_pos):
+            self.settings['fullscreen'] = not self.settings['fullscreen']
+            self.toggle_fullscreen()
+        
+        # Check difficulty options
+        for i, rect in enumerate(self.toggle_regions['difficulty']):
+            if rect.collidepoint(mouse_pos):
+                self.settings['difficulty'] = i
+        
+        # Check quality options
+        for mode, rect in zip(MODES, self.toggle_regions['quality']):
+            if rect.collidepoint(mouse_pos) and self.settings['quality'] != mode:
+                self.settings['quality'] = mode
+                quality.set_mode(mode)
+        
         return None  # No state change
     
+    def on_mouse_up(self, event):
+        """Stop dragging any slider."""
+        self.is_dragging = False
+        self.active_slider = None
+    
+    def on_mouse_motion(self, event):
+        """Drag the active slider; motion arrives coalesced to one per burst."""
+        if self.is_dragging and self.active_slider:
+            self.update_slider_value(self.active_slider, event.pos[0])
+    
     def update_slider_value(self, setting, x_pos):
         """Update slider value based on mouse position."""
         slider_rect = self.slider_regions[setting]
@@ -138,10 +222,14 @@ class SettingsMenu:
         rel_pos = max(0.0, min(1.0, (x_pos - slider_rect.left) / slider_rect.width))
         
         # Update the appropriate setting
+        key = 'music_volume' if setting == 'music' else 'sfx_volume'
+        if self.settings[key] == rel_pos:
+            return  # Nothing changed, skip the mixer calls
+        
         if setting == 'music':
             self.settings['music_volume'] = rel_pos
             # Actually update the game's music volume
-            pygame.mixer.music.set_volume(rel_pos)
+            MUSIC.set_volume(rel_pos)
         elif setting == 'sfx':
             self.settings['sfx_volume'] = rel_pos
             # Update the button sound volume
@@ -151,12 +239,7 @@ class SettingsMenu:
     
     def toggle_fullscreen(self):
         """Toggle fullscreen mode."""
-        if self.settings['fullscreen']:
-            # Switch to fullscreen
-            pygame.display.set_mode((WIDTH, HEIGHT), pygame.FULLSCREEN)
-        else:
-            # Switch to windowed
-            pygame.display.set_mode((WIDTH, HEIGHT))
+        RENDERER.set_fullscreen(self.settings['fullscreen'])
     
     def save_settings(self):
         """Save settings to a configuration file."""
@@ -165,63 +248,97 @@ class SettingsMenu:
         for setting, value in self.settings.items():
             print(f"  {setting}: {value}")
     
-    def update(self):
-        """Update menu state."""
-        time_passed = self.clock.tick(60)
-        mouse_pos = pygame.mouse.get_pos()
+    def update(self, dt):
+        """Advance menu state by one fixed step of dt seconds."""
+        time_passed = dt * 1000
+        mouse_pos = get_mouse_pos()
         
         # Update button states
         for button in self.buttons.values():
             button.update(mouse_pos, time_passed)
+        
+        # Advance running animations
+        tweens.update(dt)
             
         # Update background offset for animation
-        self.bg_offset = (self.bg_offset + 0.1) % WIDTH
+        self.prev_bg_offset = self.bg_offset
+        self.bg_offset = (self.bg_offset + BG_SCROLL_SPEED * dt) % self.size[0]
+        
+        # Move ambient particles, keeping as many as the quality tier allows
+        resize_ambient_particles(self.ambient_particles, quality.preset["particles"], self.size)
+        update_ambient_particles(self.ambient_particles, dt, self.size)
         
         return time_passed
     
-    def draw(self):
+    def interpolated_bg_offset(self, alpha):
+        """Background offset between the last two simulation steps."""
+        prev = self.prev_bg_offset
+        if self.bg_offset < prev:
+            # The offset wrapped around during the last step
+            prev -= self.size[0]
+        return (prev + (self.bg_offset - prev) * alpha) % self.size[0]
+    
+    def panel_sprites(self):
+        """Return the framed title and settings panels and where to blit them."""
+        return [
+            (get_framed_panel(self.title_frame.size, (*VERY_DARK_PURPLE, 180), GOLD),
+             (self.title_frame.x - FRAME_MARGIN, self.title_frame.y - FRAME_MARGIN)),
+            (get_framed_panel(self.settings_frame.size, (*VERY_DARK_PURPLE, 160), GOLD,
+                              display_size=self.size),
+             (self.settings_frame.x - FRAME_MARGIN, self.settings_frame.y - FRAME_MARGIN)),
+        ]
+    
+    def title_sprite(self):
+        """Return the shadowed screen title and where to blit it."""
+        return get_shadowed_text(TITLE_FONT, "Settings", GOLD, DARK_GOLD, 
+                                 [(3, 3), (2, 2)][:quality.preset["title_shadows"]], center=self.title_frame.center)
+    
+    def prewarm(self):
+        """Build everything the first frame needs, yielding each surface as it's made."""
+        self.apply_layout(RENDERER.size)
+        yield get_backdrop(self.size)
+        yield get_panel(self.size, (0, 0, 0, 160))
+        for panel, _ in self.panel_sprites():
+            yield panel
+        yield self.title_sprite()[0]
+        for label_info in self.settings_labels.values():
+            yield self.engraved_label_sprite(label_info)[0]
+        for key in self.slider_regions:
+            yield self.slider_sprite(key)[0]
+        yield self.fullscreen_toggle_sprite()[0]
+        yield self.difficulty_sprite()[0]
+        yield self.quality_sprite()[0]
+        for button in self.buttons.values():
+            yield from button.prewarm()
+        for particle in self.ambient_particles:
+            yield get_circle_sprite(int(particle['size']), particle['color'])
+    
+    def draw(self, alpha=1.0):
         """Draw the settings screen."""
-        # Draw background
-        if BACKGROUND_IMG:
-            # Create a subtle moving background effect
-            SCREEN.blit(BACKGROUND_IMG, (-self.bg_offset, 0))
-            SCREEN.blit(BACKGROUND_IMG, (WIDTH - self.bg_offset, 0))
-        else:
-            # If no background image, use a gradient
-            for y in range(HEIGHT):
-                # Create a dark gradient
-                color_value = max(0, min(50, 50 - (y / HEIGHT) * 50))
-                pygame.draw.line(SCREEN, (color_value, color_value, color_value * 0.8), 
-                               (0, y), (WIDTH, y))
-        
-        # Apply the semi-transparent overlay
-        SCREEN.blit(self.overlay, (0, 0))
-        
-        # Update and draw ambient particles
-        update_ambient_particles(self.ambient_particles)
-        
-        # Draw title frame
-        dark_frame_surface = pygame.Surface((self.title_frame.width, self.title_frame.height), pygame.SRCALPHA)
-        dark_frame_surface.fill((VERY_DARK_PURPLE[0], VERY_DARK_PURPLE[1], VERY_DARK_PURPLE[2], 180))
-        SCREEN.blit(dark_frame_surface, (self.title_frame.x, self.title_frame.y))
-        draw_decorative_frame(SCREEN, self.title_frame, GOLD, width=3, fancy=True)
-        
-        # Draw settings frame
-        settings_frame_surface = pygame.Surface((self.settings_frame.width, self.settings_frame.height), pygame.SRCALPHA)
-        settings_frame_surface.fill((VERY_DARK_PURPLE[0], VERY_DARK_PURPLE[1], VERY_DARK_PURPLE[2], 160))
-        SCREEN.blit(settings_frame_surface, (self.settings_frame.x, self.settings_frame.y))
-        draw_decorative_frame(SCREEN, self.settings_frame, GOLD, width=3, fancy=True)
+        self.apply_layout(RENDERER.size)
+        RENDERER.begin_frame()
+        SURFACE_MEMORY.begin_frame()
+        
+        # Draw background with a subtle moving effect, then the semi-transparent
+        # overlay (black with 60% opacity); these full-screen layers are
+        # composited together so they can be split across threads
+        backdrop = get_backdrop(self.size)
+        bg_offset = self.interpolated_bg_offset(alpha)
+        RENDERER.compose([
+            (backdrop, (-bg_offset, 0)),
+            (backdrop, (self.size[0] - bg_offset, 0)),
+            (get_panel(self.size, (0, 0, 0, 160)), (0, 0)),
+        ])
+        
+        # Draw ambient particles
+        draw_ambient_particles(RENDERER, self.ambient_particles, alpha)
+        
+        # Draw title and settings frames
+        for panel in self.panel_sprites():
+            RENDERER.blit(*panel)
         
         # Draw title with shadow effect
-        shadow_offsets = [(3, 3), (2, 2)]
-        for offset in shadow_offsets:
-            shadow_text = TITLE_FONT.render("Settings", True, DARK_GOLD)
-            shadow_rect = shadow_text.get_rect(center=(WIDTH//2 + offset[0], HEIGHT//6 + offset[1]))
-            SCREEN.blit(shadow_text, shadow_rect)
-            
-        title_text = TITLE_FONT.render("Settings", True, GOLD)
-        title_rect = title_text.get_rect(center=(WIDTH//2, HEIGHT//6))
-        SCREEN.blit(title_text, title_rect)
+        RENDERER.blit(*self.title_sprite())
         
         # Draw settings labels with engraved effect
         self.draw_engraved_labels()
@@ -233,107 +350,185 @@ class SettingsMenu:
         self.draw_toggles()
         
         # Draw back button
-        self.buttons['back'].draw(SCREEN)
+        self.buttons['back'].draw(RENDERER)
+        
+        if SURFACE_MEMORY.show_readout:
+            SURFACE_MEMORY.draw_readout(RENDERER, FONTS.get("monospace", 18), (20, 20), GOLD)
         
         # Draw a custom cursor instead of the default one
-        if CURSOR_IMG:
-            cursor_rect = CURSOR_IMG.get_rect(center=pygame.mouse.get_pos())
-            SCREEN.blit(CURSOR_IMG, cursor_rect)
+        draw_cursor(RENDERER)
         
         # Update the display
-        pygame.display.flip()
+        RENDERER.present()
+        PACER.presented()
+        latency.frame_presented()
+    
+    def widget_sprite(self, key, state, bounds, paint):
+        """Return a widget sprite covering bounds, repainting it only when state changes.
+        
+        paint(surface, offset) draws the widget in screen coordinates shifted by offset.
+        """
+        entry = self.widget_sprites.get(key)
+        if entry is None or entry[0] != state:
+            if entry and entry[1].get_size() == bounds.size:
+                sprite = entry[1]
+            else:
+                sprite = SURFACE_MEMORY.track("SettingsMenu", f"widget {key}",
+                                              pygame.Surface(bounds.size, pygame.SRCALPHA))
+            sprite.fill((0, 0, 0, 0))
+            paint(sprite, (-bounds.x, -bounds.y))
+            RENDERER.invalidate(sprite)
+            self.widget_sprites[key] = (state, sprite)
+        return self.widget_sprites[key][1]
+    
+    def slider_sprite(self, key):
+        """Return the sprite and position for the music or sfx slider."""
+        rect = self.slider_regions[key]
+        value = self.settings[f"{key}_volume"]
+        label = f"{int(value * 100)}%"
+        # Room for the knob at either end and the label on the right
+        bounds = pygame.Rect(rect.left - 16, rect.centery - 20, rect.width + 96, 40)
+        sprite = self.widget_sprite(key, (value, label), bounds,
+                                    lambda surface, offset: self.paint_slider(surface, rect.move(offset), value, label))
+        return sprite, bounds.topleft
+    
+    def fullscreen_toggle_sprite(self):
+        """Return the sprite and position for the fullscreen toggle and its On/Off label."""
+        toggle_rect = self.toggle_regions['fullscreen']
+        bounds = pygame.Rect(toggle_rect.left, toggle_rect.centery - 20, toggle_rect.width + 100, 40)
+        sprite = self.widget_sprite('fullscreen', self.settings['fullscreen'], bounds, 
+                                    lambda surface, offset: self.paint_fullscreen_toggle(surface, toggle_rect.move(offset)))
+        return sprite, bounds.topleft
+    
+    def difficulty_sprite(self):
+        """Return the sprite and position for the difficulty options."""
+        difficulty_rects = self.toggle_regions['difficulty']
+        bounds = difficulty_rects[0].unionall(difficulty_rects[1:])
+        sprite = self.widget_sprite('difficulty', self.settings['difficulty'], bounds,
+                                    lambda surface, offset: self.paint_difficulty(surface, [r.move(offset) for r in difficulty_rects]))
+        return sprite, bounds.topleft
+    
+    def quality_sprite(self):
+        """Return the sprite and position for the quality options."""
+        quality_rects = self.toggle_regions['quality']
+        bounds = quality_rects[0].unionall(quality_rects[1:])
+        sprite = self.widget_sprite('quality', self.settings['quality'], bounds,
+                                    lambda surface, offset: self.paint_quality(surface, [r.move(offset) for r in quality_rects]))
+        return sprite, bounds.topleft
     
     def draw_sliders(self):
         """Draw slider controls."""
-        # Music volume slider
-        self.draw_slider(
-            self.slider_regions['music'], 
-            self.settings['music_volume'], 
-            f"{int(self.settings['music_volume'] * 100)}%"
-        )
-        
-        # SFX volume slider
-        self.draw_slider(
-            self.slider_regions['sfx'], 
-            self.settings['sfx_volume'],
-            f"{int(self.settings['sfx_volume'] * 100)}%"
-        )
+        RENDERER.blit(*self.slider_sprite('music'))
+        RENDERER.blit(*self.slider_sprite('sfx'))
     
-    def draw_slider(self, rect, value, label):
-        """Draw an individual slider with given value."""
+    def paint_slider(self, surface, rect, value, label):
+        """Paint a slider onto surface."""
         # Draw slider background
-        pygame.draw.rect(SCREEN, DARK_GOLD, rect, border_radius=5)
+        pygame.draw.rect(surface, DARK_GOLD, rect, border_radius=5)
         
         # Draw slider fill
         fill_rect = pygame.Rect(rect.left, rect.top, rect.width * value, rect.height)
-        pygame.draw.rect(SCREEN, GOLD, fill_rect, border_radius=5)
+        pygame.draw.rect(surface, GOLD, fill_rect, border_radius=5)
         
-        # Draw slider knob
+        # Draw slider knob, opaque as it always was when drawn on the display surface
         knob_pos = (rect.left + rect.width * value, rect.centery)
-        pygame.draw.circle(SCREEN, DARK_RED, knob_pos, 15)
-        pygame.draw.circle(SCREEN, LIGHT_RED, knob_pos, 13)
-        pygame.draw.circle(SCREEN, GOLD, knob_pos, 5)
+        pygame.draw.circle(surface, DARK_RED[:3], knob_pos, 15)
+        pygame.draw.circle(surface, LIGHT_RED[:3], knob_pos, 13)
+        pygame.draw.circle(surface, GOLD, knob_pos, 5)
         
         # Draw label
-        label_font = pygame.font.SysFont("serif", 24)
+        label_font = FONTS.get("serif", 24)
         label_text = label_font.render(label, True, GOLD)
         label_rect = label_text.get_rect(midright=(rect.right + 80, rect.centery))
-        SCREEN.blit(label_text, label_rect)
+        surface.blit(label_text, label_rect)
+    
+    def engraved_label_sprite(self, label_info):
+        """Return a setting label with its engraved shadow, and where to blit it."""
+        # The darker "shadow" text sits slightly below the main text
+        return get_shadowed_text(MENU_FONT, label_info["text"], GOLD, DARK_GOLD, 
+                                 [(0, 2)], midleft=label_info["pos"])
     
     def draw_engraved_labels(self):
         """Draw setting labels with an engraved effect."""
-        for setting, label_info in self.settings_labels.items():
-            # First draw the darker "shadow" text slightly offset
-            shadow_text = MENU_FONT.render(label_info["text"], True, DARK_GOLD)
-            shadow_rect = shadow_text.get_rect(midleft=(label_info["pos"][0], label_info["pos"][1] + 2))
-            SCREEN.blit(shadow_text, shadow_rect)
-            
-            # Then draw the main text slightly above to create engraved effect
-            main_text = MENU_FONT.render(label_info["text"], True, GOLD)
-            main_rect = main_text.get_rect(midleft=(label_info["pos"][0], label_info["pos"][1]))
-            SCREEN.blit(main_text, main_rect)
+        for label_info in self.settings_labels.values():
+            RENDERER.blit(*self.engraved_label_sprite(label_info))
             
     def draw_toggles(self):
         """Draw toggle and selection controls."""
-        # Fullscreen toggle
-        toggle_rect = self.toggle_regions['fullscreen']
-        pygame.draw.rect(SCREEN, DARK_GOLD, toggle_rect, border_radius=5)
+        RENDERER.blit(*self.fullscreen_toggle_sprite())
+        RENDERER.blit(*self.difficulty_sprite())
+        RENDERER.blit(*self.quality_sprite())
+    
+    def paint_fullscreen_toggle(self, surface, toggle_rect):
+        """Paint the fullscreen toggle onto surface."""
+        pygame.draw.rect(surface, DARK_GOLD, toggle_rect, border_radius=5)
         
         if self.settings['fullscreen']:
             # Filled when enabled
-            pygame.draw.rect(SCREEN, GOLD, pygame.Rect(toggle_rect.left + 3, toggle_rect.top + 3, 
-                                                    toggle_rect.width - 6, toggle_rect.height - 6), 
+            pygame.draw.rect(surface, GOLD, pygame.Rect(toggle_rect.left + 3, toggle_rect.top + 3, 
+                                                     toggle_rect.width - 6, toggle_rect.height - 6), 
                            border_radius=3)
         
         # Label for fullscreen
         toggle_label = "On" if self.settings['fullscreen'] else "Off"
-        label_font = pygame.font.SysFont("serif", 24)
+        label_font = FONTS.get("serif", 24)
         label_text = label_font.render(toggle_label, True, GOLD)
         label_rect = label_text.get_rect(midleft=(toggle_rect.right + 20, toggle_rect.centery))
-        SCREEN.blit(label_text, label_rect)
-        
-        # Difficulty selection
+        surface.blit(label_text, label_rect)
+    
+    def paint_difficulty(self, surface, rects):
+        """Paint the difficulty options onto surface."""
+        label_font = FONTS.get("serif", 24)
         difficulty_labels = ["Easy", "Normal", "Hard"]
-        for i, rect in enumerate(self.toggle_regions['difficulty']):
+        for i, rect in enumerate(rects):
             # Draw rectangle for each option
             color = GOLD if i == self.settings['difficulty'] else DARK_GOLD
-            pygame.draw.rect(SCREEN, color, rect, border_radius=5)
+            pygame.draw.rect(surface, color, rect, border_radius=5)
             
             # Draw label
             diff_text = label_font.render(difficulty_labels[i], True, VERY_DARK_PURPLE)
             diff_rect = diff_text.get_rect(center=rect.center)
-            SCREEN.blit(diff_text, diff_rect)
+            surface.blit(diff_text, diff_rect)
+    
+    def paint_quality(self, surface, rects):
+        """Paint the quality options onto surface."""
+        label_font = FONTS.get("serif", 24)
+        quality_labels = ["Auto", "Low", "Med", "High", "Ultra"]
+        for mode, label, rect in zip(MODES, quality_labels, rects):
+            color = GOLD if mode == self.settings['quality'] else DARK_GOLD
+            pygame.draw.rect(surface, color, rect, border_radius=5)
+            
+            quality_text = label_font.render(label, True, VERY_DARK_PURPLE)
+            quality_rect = quality_text.get_rect(center=rect.center)
+            surface.blit(quality_text, quality_rect)
     
     def run(self):
         """Run the settings menu loop."""
+        # Don't count time spent in other screens as simulation time
+        PACER.reset()
+        self.timestep.reset()
+        self.events.activate()
+        
         while True:
+            # Wait for the frame first, so the events we handle are as fresh as possible
+            frame_time = next_frame_time(PACER)
+            work_start = time.perf_counter()
+            prewarmer.frame_started()
+            
             # Handle events
             state_change = self.handle_events()
             if state_change:
                 return state_change
             
-            # Update
-            self.update()
+            # Update at a fixed rate, catching up on any time that has passed
+            for _ in range(self.timestep.advance(frame_time)):
+                self.update(self.timestep.step)
+            
+            # Draw, interpolating between the last two simulation states
+            self.draw(self.timestep.alpha)
+            
+            # Feed the frame's work time (excluding the wait) to auto quality
+            quality.observe((time.perf_counter() - work_start) * 1000)
             
-            # Draw
-            self.draw()
\ No newline at end of file
+            # Use idle time to warm up the scenes we might switch to
+            prewarmer.frame_done(idle=tweens.idle)
\ No newline at end of file
@@ -0,0 +1,104 @@
+"""
+Tween engine for UI animation.
+
+Tweens animate an attribute of an object towards a target value and retire
+themselves once they arrive, so idle widgets cost nothing per frame.
+"""
+import math
+
+def linear(t):
+    return t
+
+def ease_in_quad(t):
+    return t * t
+
+def ease_out_quad(t):
+    return t * (2 - t)
+
+def ease_in_out_sine(t):
+    return 0.5 - math.cos(math.pi * t) / 2
+
+def ease_out_cubic(t):
+    return 1 - (1 - t) ** 3
+
+def interpolate(start, end, amount):
+    """Interpolate numbers or tuples of numbers (e.g. RGBA colors)."""
+    if isinstance(start, tuple):
+        values = (a + (b - a) * amount for a, b in zip(start, end))
+        if all(isinstance(v, int) for v in start + end):
+            return tuple(int(round(v)) for v in values)
+        return tuple(values)
+    return start + (end - start) * amount
+
+class Tween:
+    """Animates obj.attr from its current value to end over duration seconds."""
+    
+    def __init__(self, obj, attr, end, duration, easing=ease_out_quad, on_change=None):
+        self.obj = obj
+        self.attr = attr
+        self.start = getattr(obj, attr)
+        self.end = end
+        self.duration = duration
+        self.easing = easing
+        self.on_change = on_change
+        self.elapsed = 0.0
+    
+    def step(self, dt):
+        """Advance the tween; return False once it has reached its end value."""
+        self.elapsed += dt
+        done = self.elapsed >= self.duration
+        amount = 1.0 if done else self.easing(self.elapsed / self.duration)
+        setattr(self.obj, self.attr, self.end if done else interpolate(self.start, self.end, amount))
+        if self.on_change:
+            self.on_change()
+        return not done
+
+class TweenEngine:
+    """Updates all active tweens in one pass and tracks shared animation time."""
+    
+    def __init__(self):
+        self.active = {}  # (id(obj), attr) -> Tween
+        self.time = 0.0
+        self.waves = {}
+    
+    def to(self, obj, attr, end, duration, easing=ease_out_quad, on_change=None):
+        """Start animating obj.attr towards end, replacing any running tween."""
+        key = (id(obj), attr)
+        if getattr(obj, attr) == end:
+            # Already there; just stop whatever was moving it
+            self.active.pop(key, None)
+            return None
+        tween = Tween(obj, attr, end, duration, easing, on_change)
+        self.active[key] = tween
+        return tween
+    
+    def is_animating(self, obj, attr=None):
+        """Return True if obj (or obj.attr) has a running tween."""
+        if attr is not None:
+            return (id(obj), attr) in self.active
+        return any(key[0] == id(obj) for key in self.active)
+    
+    @property
+    def idle(self):
+        """True when no tweens are running."""
+        return not self.active
+    
+    def update(self, dt):
+        """Advance shared time and every active tween, retiring finished ones."""
+        self.time += dt
+        self.waves.clear()
+        if not self.active:
+            return
+        finished = [key for key, tween in self.active.items() if not tween.step(dt)]
+        for key in finished:
+            del self.active[key]
+    
+    def wave(self, frequency):
+        """Return sin(time * frequency), computed at most once per update."""
+        value = self.waves.get(frequency)
+        if value is None:
+            value = self.waves[frequency] = math.sin(self.time * frequency)
+        return value
+
+# Shared engine driven by the active screen
+tweens = TweenEngine()
@@ -0,0 +1,122 @@
+"""
+Tests for the background music service, using a stub mixer.
+"""
+import os
+import sys
+import threading
+import time
+import unittest
+
+import pygame
+
+# Add the root directory to the path so we can import src
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.audio import MusicService
+
+class StubMusic:
+    """Stands in for pygame.mixer.music, recording which thread makes each call."""
+
+    def __init__(self, mixer):
+        self.mixer = mixer
+        self.busy = False
+
+    def load(self, path):
+        self.mixer.record("load", os.path.basename(path))
+        # Opening a file is slow enough to show up if it ever ran on the caller's thread
+        time.sleep(self.mixer.load_delay)
+        if os.path.basename(path) not in self.mixer.available:
+            raise pygame.error(f"No file '{path}' found")
+
+    def play(self, loops=0, fade_ms=0):
+        self.mixer.record("play", loops)
+        self.busy = True
+
+    def fadeout(self, ms):
+        self.mixer.record("fadeout", ms)
+        self.busy = False
+
+    def set_volume(self, volume):
+        self.mixer.record("set_volume", volume)
+
+    def get_busy(self):
+        self.mixer.record("get_busy", None)
+        return self.busy
+
+class StubMixer:
+    """Stands in for pygame.mixer."""
+
+    def __init__(self, available, load_delay=0.2):
+        self.available = set(available)
+        self.load_delay = load_delay
+        self.calls = []  # (name, argument, thread)
+        self.music = StubMusic(self)
+
+    def record(self, name, arg):
+        self.calls.append((name, arg, threading.current_thread()))
+
+    def get_init(self):
+        self.record("get_init", None)
+        return (44100, -16, 2)
+
+    def called(self, name):
+        return [arg for call, arg, _ in self.calls if call == name]
+
+class MusicServiceTest(unittest.TestCase):
+
+    def create(self, playlists, available):
+        mixer = StubMixer(available)
+        music = MusicService("audio", playlists, volume=0.4, crossfade=0.0, mixer=mixer, poll_interval=0.01)
+        return mixer, music
+
+    def assert_worker_only(self, mixer):
+        """Every mixer call was made from the music worker, never the caller's thread."""
+        self.assertTrue(mixer.calls)
+        threads = {thread.name for _, _, thread in mixer.calls}
+        self.assertEqual(threads, {"music"})
+
+    def test_commands_only_enqueue(self):
+        mixer, music = self.create({"menu": ["theme.ogg"]}, ["theme.ogg"])
+
+        start = time.perf_counter()
+        music.play_scene("menu")
+        music.set_volume(0.7)
+        elapsed = time.perf_counter() - start
+        music.close(timeout=5)
+
+        # Loading takes 0.2 s in the stub, so the calls can't have waited for it
+        self.assertLess(elapsed, mixer.load_delay / 2)
+        self.assert_worker_only(mixer)
+        self.assertEqual(mixer.called("load"), ["theme.ogg"])
+        self.assertEqual(mixer.called("play"), [-1])
+        self.assertEqual(mixer.called("set_volume")[-1], 0.7)
+
+    def test_missing_track_is_skipped(self):
+        mixer, music = self.create({"menu": ["missing.ogg", "theme.ogg"]}, ["theme.ogg"])
+
+        start = time.perf_counter()
+        music.play_scene("menu")
+        elapsed = time.perf_counter() - start
+        music.close(timeout=5)
+
+        self.assertLess(elapsed, mixer.load_delay / 2)
+        self.assert_worker_only(mixer)
+        self.assertEqual(mixer.called("load"), ["missing.ogg", "theme.ogg"])
+        self.assertEqual(len(mixer.called("play")), 1)
+        self.assertIn("missing.ogg", music.missing)
+
+    def test_scene_switch_fades_out_first(self):
+        mixer, music = self.create({"menu": ["theme.ogg"], "battle": ["battle.ogg"]},
+                                   ["theme.ogg", "battle.ogg"])
+
+        music.play_scene("menu")
+        music.play_scene("menu")  # Already playing, so no restart
+        music.play_scene("battle")
+        music.close(timeout=5)
+
+        self.assert_worker_only(mixer)
+        self.assertEqual(mixer.called("load"), ["theme.ogg", "battle.ogg"])
+        names = [name for name, _, _ in mixer.calls if name in ("play", "fadeout")]
+        self.assertEqual(names, ["play", "fadeout", "play"])
+
+if __name__ == "__main__":
+    unittest.main()